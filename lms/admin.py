@@ -1,13 +1,143 @@
 from django.contrib import admin
-from .models import Course, Enrollment, Profile, Lesson, LessonProgress, Quiz, Question, Assignment, Submission, Certificate
-
-admin.site.register(Course)
-admin.site.register(Enrollment)
-admin.site.register(Profile)
-admin.site.register(Lesson)
-admin.site.register(LessonProgress)
-admin.site.register(Quiz)
-admin.site.register(Question)
-admin.site.register(Assignment)
-admin.site.register(Submission)
-admin.site.register(Certificate)
\ No newline at end of file
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from .db import estimated_count
+from .models import Course, Enrollment, Profile, Lesson, LessonProgress, Quiz, Question, Assignment, Submission, Certificate, QuizAttempt, AttemptAnswer, CourseProgress
+
+# Below this many rows an exact COUNT(*) is cheap enough.
+EXACT_COUNT_LIMIT = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses the table's estimated size for unfiltered changelists of large tables."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables that grow with the number of students."""
+    paginator = EstimatedCountPaginator
+    # The "N total" link would count the whole table on every page.
+    show_full_result_count = False
+    list_per_page = 50
+
+
+# No list_filter: a course filter lists every course in the sidebar, and a
+# filter on an unindexed flag (role, is_completed, passed, ...) scans the
+# table, including for the exact COUNT(*) a filtered changelist needs.
+# Enrollment, certificate and progress changelists still narrow to one
+# course with ?course__id__exact=<id>, which goes through the course_id
+# index. Usernames are matched exactly so searches use the unique index too.
+
+@admin.register(Profile)
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ('user', 'role')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('=user__username',)
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ('title', 'instructor', 'lesson_count', 'quiz_count', 'assignment_count')
+    list_select_related = ('instructor',)
+    raw_id_fields = ('instructor',)
+    search_fields = ('title', '=instructor__username')
+
+
+@admin.register(Lesson)
+class LessonAdmin(admin.ModelAdmin):
+    list_display = ('title', 'course', 'video_provider')
+    list_select_related = ('course',)
+    autocomplete_fields = ('course',)
+    search_fields = ('title',)
+
+
+@admin.register(Quiz)
+class QuizAdmin(admin.ModelAdmin):
+    list_display = ('title', 'course')
+    list_select_related = ('course',)
+    autocomplete_fields = ('course',)
+    search_fields = ('title',)
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = ('text', 'quiz', 'correct_option')
+    list_select_related = ('quiz',)
+    autocomplete_fields = ('quiz',)
+    search_fields = ('text',)
+
+
+@admin.register(Assignment)
+class AssignmentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'course')
+    list_select_related = ('course',)
+    autocomplete_fields = ('course',)
+    search_fields = ('title',)
+
+
+@admin.register(Enrollment)
+class EnrollmentAdmin(LargeTableAdmin):
+    list_display = ('student', 'course', 'enrolled_at')
+    list_select_related = ('student', 'course')
+    raw_id_fields = ('student',)
+    autocomplete_fields = ('course',)
+    search_fields = ('=student__username',)
+
+
+@admin.register(LessonProgress)
+class LessonProgressAdmin(LargeTableAdmin):
+    list_display = ('student', 'lesson', 'viewed')
+    list_select_related = ('student', 'lesson')
+    raw_id_fields = ('student', 'lesson')
+    search_fields = ('=student__username',)
+
+
+@admin.register(Submission)
+class SubmissionAdmin(LargeTableAdmin):
+    list_display = ('student', 'assignment', 'original_name', 'size', 'submitted_at')
+    list_select_related = ('student', 'assignment')
+    raw_id_fields = ('student', 'assignment')
+    search_fields = ('=student__username', '=sha256')
+
+
+@admin.register(Certificate)
+class CertificateAdmin(LargeTableAdmin):
+    list_display = ('student', 'course', 'is_completed', 'issued_at')
+    list_select_related = ('student', 'course')
+    raw_id_fields = ('student',)
+    autocomplete_fields = ('course',)
+    search_fields = ('=student__username',)
+
+
+@admin.register(QuizAttempt)
+class QuizAttemptAdmin(LargeTableAdmin):
+    list_display = ('student', 'quiz', 'score', 'total', 'passed', 'submitted_at')
+    list_select_related = ('student', 'quiz')
+    raw_id_fields = ('student', 'quiz')
+    search_fields = ('=student__username',)
+
+
+@admin.register(AttemptAnswer)
+class AttemptAnswerAdmin(LargeTableAdmin):
+    list_display = ('attempt', 'question', 'selected_option', 'is_correct')
+    list_select_related = ('attempt', 'question')
+    raw_id_fields = ('attempt', 'question')
+
+
+@admin.register(CourseProgress)
+class CourseProgressAdmin(LargeTableAdmin):
+    list_display = ('student', 'course', 'lessons_viewed', 'assignments_submitted', 'quizzes_passed', 'updated_at')
+    list_select_related = ('student', 'course')
+    raw_id_fields = ('student',)
+    autocomplete_fields = ('course',)
+    search_fields = ('=student__username',)
\ No newline at end of file
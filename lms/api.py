@@ -0,0 +1,93 @@
+"""Read-only JSON endpoints for clients that poll a student's progress.
+
+Each response is built from one query (``lms.progress.student_progress()``)
+and carries an ETag derived from the progress, submission and certificate
+timestamps and the course structure versions it was built from, so a poll
+that finds nothing new is answered ``304 Not Modified`` without serialising
+anything.
+"""
+import hashlib
+from functools import wraps
+
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .db import read_replica
+from .instrumentation import query_budget
+from .progress import student_progress
+
+# Most courses one batched request may ask for.
+MAX_BATCH = 100
+
+
+def api_login_required(view):
+    """Answer anonymous requests with a JSON 401 instead of a login redirect."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _etag(rows):
+    version = hashlib.sha256()
+    for row in rows:
+        version.update(repr((
+            row['course_id'], row['course__structure_version'], row['updated_at'],
+            row['progress_updated_at'], row['last_submission_at'],
+        )).encode())
+    return f'"{version.hexdigest()[:32]}"'
+
+
+def _course(row):
+    return {
+        'course': row['course_id'],
+        'title': row['course__title'],
+        'lessons': {'viewed': row['lessons_viewed'] or 0, 'total': row['course__lesson_count']},
+        'assignments': {'submitted': row['assignments_submitted'] or 0, 'total': row['course__assignment_count']},
+        'quizzes': {'passed': row['quizzes_passed'] or 0, 'total': row['course__quiz_count']},
+        'last_submission_at': row['last_submission_at'],
+        'certificate': {
+            'id': row['id'],
+            'completed': row['is_completed'],
+            'url': reverse('lms:certificate_view', args=[row['id']]) if row['is_completed'] else None,
+        },
+    }
+
+
+def _respond(request, rows, payload):
+    etag = _etag(rows)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(payload(rows))
+    response['ETag'] = etag
+    # Clients may keep the response but have to revalidate it on every poll.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@query_budget(3)
+@api_login_required
+@read_replica
+def course_progress(request, course_id):
+    rows = student_progress(request.user, [course_id])
+    if not rows:
+        return JsonResponse({'error': 'Not enrolled in this course.'}, status=404)
+    return _respond(request, rows, lambda rows: _course(rows[0]))
+
+
+@query_budget(3)
+@api_login_required
+@read_replica
+def progress(request):
+    """Progress in every enrolled course, or in the ``?course=<id>`` ones (repeatable)."""
+    course_ids = request.GET.getlist('course')
+    if course_ids:
+        if not all(course_id.isdigit() for course_id in course_ids):
+            return JsonResponse({'error': 'Course ids must be integers.'}, status=400)
+        if len(course_ids) > MAX_BATCH:
+            return JsonResponse({'error': f'Ask for at most {MAX_BATCH} courses at a time.'}, status=400)
+    rows = student_progress(request.user, [int(course_id) for course_id in course_ids] if course_ids else None)
+    return _respond(request, rows, lambda rows: {'courses': [_course(row) for row in rows]})
\ No newline at end of file
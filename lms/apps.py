@@ -1,5 +1,25 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 class LmsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'lms'
\ No newline at end of file
+    name = 'lms'
+
+    def ready(self):
+        from importlib import import_module
+
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from .db import close_replaced_replica, configure_connection
+
+        # Importing the module registers its receivers.
+        import_module(f'{self.name}.signals')
+
+        connection_created.connect(configure_connection, dispatch_uid='lms.db.configure_connection')
+        request_started.connect(close_replaced_replica, dispatch_uid='lms.db.close_replaced_replica')
+
+        if getattr(settings, 'LMS_WARM_UP', False):
+            from .warmup import warm_up
+
+            warm_up()
\ No newline at end of file
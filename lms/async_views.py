@@ -0,0 +1,124 @@
+"""Async versions of the read-heavy views, for ASGI deployments.
+
+``lms.urls`` routes ``dashboard``, ``instructor_dashboard``, ``course_list``
+and ``lesson_detail`` here with ``LMS_ASYNC_VIEWS = True``. Queries that do
+not depend on each other are started together with ``asyncio.gather()``.
+Django 4.2's async ORM still hands every query of a request to that
+request's thread, so they are not yet run in parallel; the event loop is
+free to serve other requests while they run. Templates are rendered in the
+same thread, since the auth and messages context processors may read the
+session.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+from django.shortcuts import render, redirect
+
+from .catalog import catalog_page_for_request, enrolled_catalog, load_catalog
+from .db import read_replica
+from .instrumentation import query_budget
+from .models import Course, Enrollment, Lesson, Certificate
+from .progress import acourse_progress
+from .progress_log import record_view
+from .roles import role_required
+
+__all__ = ['dashboard', 'instructor_dashboard', 'course_list', 'lesson_detail']
+
+_render = sync_to_async(render)
+
+
+def login_required(view):
+    """``django.contrib.auth.decorators.login_required`` for async views."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # request.user is loaded from the session on first access.
+        if not await sync_to_async(lambda: request.user.is_authenticated)():
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _catalog(request, content):
+    page, pager = catalog_page_for_request(request)
+    return load_catalog(request.user, page.courses, content=content), pager
+
+
+async def _certificates(user):
+    return [certificate async for certificate in Certificate.objects.filter(student=user).select_related('course')]
+
+
+@query_budget(10)
+@login_required
+@role_required()
+@read_replica
+async def dashboard(request):
+    if request.role == 'instructor':
+        page, pager = await sync_to_async(catalog_page_for_request)(
+            request, instructor=request.user.username, enrolled=None,
+        )
+        return await _render(request, 'dashboard.html', {
+            'courses': page.courses,
+            'is_instructor': True,
+            **pager,
+        })
+    (courses, pager), enrolled_courses, certificates = await asyncio.gather(
+        sync_to_async(_catalog)(request, content=False),
+        sync_to_async(enrolled_catalog)(request.user),
+        _certificates(request.user),
+    )
+    return await _render(request, 'dashboard.html', {
+        'courses': courses,
+        'enrolled_courses': enrolled_courses,
+        'is_instructor': False,
+        'certificates': certificates,
+        **pager,
+    })
+
+
+@query_budget(10)
+@login_required
+@role_required('instructor', message='Only instructors can access this dashboard.', redirect_to='lms:dashboard')
+@read_replica
+async def instructor_dashboard(request):
+    return await _render(request, 'instructor_dashboard.html', {
+        'course_progress': await acourse_progress(Course.objects.filter(instructor=request.user)),
+    })
+
+
+@query_budget(10)
+@login_required
+@role_required()
+@read_replica
+async def course_list(request):
+    courses, pager = await sync_to_async(_catalog)(request, content=True)
+    return await _render(request, 'course_list.html', {
+        'courses': courses,
+        'is_instructor': request.role == 'instructor',
+        'instructor': request.GET.get('instructor', ''),
+        'enrolled': request.GET.get('enrolled', ''),
+        **pager,
+    })
+
+
+@query_budget(18)
+@login_required
+@role_required()
+async def lesson_detail(request, course_id, lesson_id):
+    lookups = [Lesson.objects.filter(id=lesson_id, course_id=course_id).afirst()]
+    if request.role == 'student':
+        lookups.append(Enrollment.objects.filter(student=request.user, course_id=course_id).aexists())
+    lesson, *enrolled = await asyncio.gather(*lookups)
+    if lesson is None:
+        raise Http404('No Lesson matches the given query.')
+    if request.role == 'student':
+        if not enrolled[0]:
+            messages.error(request, 'You must enroll in the course to view lessons.')
+            return redirect('lms:course_list')
+        # Buffered and written in batches, together with the course progress.
+        await sync_to_async(record_view)(request.user.id, lesson.id)
+
+    return await _render(request, 'lesson_detail.html', {'lesson': lesson})
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Session storage and user lookups for authenticated requests.
+
+Every request from a logged-in browser loads its session and then its user.
+With Django's defaults both come from the database: the ``django_session``
+row and the ``auth_user`` row. Under a login spike those two queries on every
+page, plus the session writes at login, are what saturates SQLite.
+
+``session_engine()`` picks ``SESSION_ENGINE`` from ``LMS_SESSION_STRATEGY``:
+
+* ``db`` (default): sessions in the database, Django's default.
+* ``cached_db``: written through to the database, read from the cache named
+  by ``SESSION_CACHE_ALIAS``. Use a cache shared by all workers (Redis or
+  Memcached); with a per-process cache, a session ended in one worker stays
+  valid in the others until it is evicted.
+* ``signed_cookies``: the session is kept in a signed cookie, so reading and
+  writing it needs no storage at all. Session data is visible to the client,
+  and a logged out cookie stays valid until it expires if it was copied.
+
+``CachedModelBackend`` keeps users in the cache named by ``LMS_USER_CACHE``
+(default ``'default'``) for ``LMS_USER_CACHE_TIMEOUT`` seconds (default 300),
+so authenticated pages do not load ``auth_user`` on every request. Saving or
+deleting a user drops the entry; the timeout bounds how long other workers
+with a per-process cache can keep the old one.
+"""
+import os
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+DEFAULT_USER_CACHE_TIMEOUT = 300
+
+
+def session_engine(environ=os.environ):
+    """Return ``SESSION_ENGINE`` for the strategy named by ``LMS_SESSION_STRATEGY``; see the module docstring."""
+    strategy = environ.get('LMS_SESSION_STRATEGY', 'db')
+    if strategy not in SESSION_ENGINES:
+        raise ValueError(f"Unknown LMS_SESSION_STRATEGY {strategy!r}; use {', '.join(SESSION_ENGINES)}.")
+    return SESSION_ENGINES[strategy]
+
+
+def user_cache():
+    return caches[getattr(settings, 'LMS_USER_CACHE', 'default')]
+
+
+def _cache_key(user_id):
+    return f'lms:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    user_cache().delete(_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` that looks the user of a session up in the cache first.
+
+    Django still checks the user's session hash against the session, so a
+    password change logs other sessions out as soon as the entry is dropped.
+    """
+
+    def get_user(self, user_id):
+        cache = user_cache()
+        user = cache.get(_cache_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(_cache_key(user_id), user,
+                      getattr(settings, 'LMS_USER_CACHE_TIMEOUT', DEFAULT_USER_CACHE_TIMEOUT))
+        return user if self.user_can_authenticate(user) else None
\ No newline at end of file
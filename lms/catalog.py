@@ -0,0 +1,114 @@
+from collections import namedtuple
+
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Substr
+
+from .models import Course, Enrollment
+from .structure import attach_structure_html
+
+PAGE_SIZE = 20
+SUMMARY_LENGTH = 200
+
+CatalogPage = namedtuple('CatalogPage', 'courses next_cursor previous_cursor')
+
+
+def catalog_courses():
+    """Courses with only the columns the catalog renders.
+
+    ``description`` is deferred; each course carries a ``summary`` cut down
+    to ``SUMMARY_LENGTH`` characters by the database instead.
+    """
+    return Course.objects.only('id', 'title', 'instructor_id', 'structure_version').annotate(
+        summary=Substr('description', 1, SUMMARY_LENGTH + 1)
+    )
+
+
+def _shorten(courses):
+    for course in courses:
+        if len(course.summary) > SUMMARY_LENGTH:
+            course.summary = course.summary[:SUMMARY_LENGTH].rstrip() + '…'
+    return courses
+
+
+def catalog_page(user, after=None, before=None, instructor=None, enrolled=None, page_size=PAGE_SIZE):
+    """One page of the course catalog, ordered by id.
+
+    Pages are addressed by the id of the course they continue ``after`` (or
+    precede, ``before``) rather than by offset, so every page costs the same
+    index range scan however deep it is. ``instructor`` filters by username
+    and ``enrolled`` to courses ``user`` is (True) or is not (False)
+    enrolled in.
+    """
+    courses = catalog_courses()
+    if instructor:
+        courses = courses.filter(instructor__username=instructor)
+    if enrolled is not None:
+        is_enrolled = Exists(Enrollment.objects.filter(student=user, course=OuterRef('pk')))
+        courses = courses.filter(is_enrolled if enrolled else ~is_enrolled)
+
+    if before is not None:
+        rows = list(courses.filter(id__lt=before).order_by('-id')[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        next_cursor = rows[-1].id if rows else None
+        previous_cursor = rows[0].id if has_more else None
+    else:
+        rows = list(courses.filter(id__gt=after or 0).order_by('id')[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = rows[-1].id if has_more else None
+        previous_cursor = rows[0].id if rows and after else None
+    return CatalogPage(_shorten(rows), next_cursor, previous_cursor)
+
+
+def catalog_page_for_request(request, **filters):
+    """``catalog_page()`` for the cursors and filters in ``request.GET``.
+
+    Keyword arguments override the filters taken from the query string.
+    Returns the page and the ``next_url``/``previous_url`` template context.
+    """
+    def cursor(name):
+        value = request.GET.get(name, '')
+        return int(value) if value.isdigit() else None
+
+    def page_url(name, value):
+        query = request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query[name] = value
+        return f'?{query.urlencode()}'
+
+    filters.setdefault('instructor', request.GET.get('instructor', '').strip())
+    filters.setdefault('enrolled', {'yes': True, 'no': False}.get(request.GET.get('enrolled')))
+    page = catalog_page(request.user, after=cursor('after'), before=cursor('before'), **filters)
+    return page, {
+        'next_url': page_url('after', page.next_cursor) if page.next_cursor else None,
+        'previous_url': page_url('before', page.previous_cursor) if page.previous_cursor else None,
+    }
+
+
+def load_catalog(user, courses, content=True):
+    """Annotate ``courses`` for ``user`` in a fixed number of queries.
+
+    Every course is annotated with ``is_enrolled``; unless ``content`` is
+    False, courses the user is enrolled in also carry ``structure_html``,
+    their cached lesson, quiz and assignment lists.
+    """
+    courses = list(courses)
+    enrolled_ids = set(
+        Enrollment.objects.filter(student=user, course_id__in=[course.id for course in courses])
+        .values_list('course_id', flat=True)
+    )
+    for course in courses:
+        course.is_enrolled = course.id in enrolled_ids
+    if content:
+        attach_structure_html(course for course in courses if course.is_enrolled)
+    return courses
+
+
+def enrolled_catalog(user):
+    """Courses ``user`` is enrolled in, with their ``structure_html``."""
+    courses = _shorten(list(catalog_courses().filter(enrollment__student=user).order_by('id')))
+    for course in courses:
+        course.is_enrolled = True
+    return attach_structure_html(courses)
\ No newline at end of file
@@ -0,0 +1,215 @@
+import hashlib
+import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .models import Certificate
+
+# ReportLab is imported inside the functions that draw, not here: it is the
+# slowest import behind the URLconf and most workers never render a PDF.
+
+
+@lru_cache(maxsize=None)
+def _styles():
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+
+    return {
+        'header': ParagraphStyle(
+            name='Header',
+            fontName='Helvetica-Bold',
+            fontSize=30,
+            alignment=1,  # Center
+            spaceAfter=20,
+            textColor=colors.darkblue
+        ),
+        'title': ParagraphStyle(
+            name='Title',
+            fontName='Helvetica-Bold',
+            fontSize=24,
+            alignment=1,
+            spaceAfter=20
+        ),
+        'normal': ParagraphStyle(
+            name='Normal',
+            fontName='Helvetica',
+            fontSize=14,
+            alignment=1,
+            spaceAfter=10
+        ),
+        'small': ParagraphStyle(
+            name='Small',
+            fontName='Helvetica',
+            fontSize=10,
+            alignment=1,
+            spaceAfter=10
+        ),
+        'signature': ParagraphStyle(
+            name='Signature',
+            fontName='Helvetica-Oblique',
+            fontSize=14,
+            alignment=1,
+            spaceBefore=20,
+            textColor=colors.black
+        ),
+    }
+
+
+def _draw_page_frame(canvas, doc):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+
+    # Outer border
+    canvas.setLineWidth(3)
+    canvas.setStrokeColor(colors.black)
+    canvas.rect(0.5 * inch, 0.5 * inch, letter[0] - 1 * inch, letter[1] - 1 * inch)
+    # Inner border (decorative)
+    canvas.setLineWidth(1)
+    canvas.setStrokeColor(colors.grey)
+    canvas.rect(0.75 * inch, 0.75 * inch, letter[0] - 1.5 * inch, letter[1] - 1.5 * inch)
+
+
+def _inputs(certificate):
+    return (
+        str(certificate.id),
+        certificate.student.username,
+        certificate.course.title,
+        certificate.course.instructor.username,
+        certificate.issued_at.strftime('%Y-%m-%d'),
+    )
+
+
+def certificate_digest(certificate):
+    """Hash of everything printed on the certificate."""
+    return hashlib.sha256('\0'.join(_inputs(certificate)).encode()).hexdigest()
+
+
+def certificate_path(digest):
+    return f'certificates/{digest[:2]}/{digest}.pdf'
+
+
+def render_pdf(inputs):
+    """Build the PDF from the plain values returned by ``_inputs``.
+
+    Takes no model instances so it can run in a worker process.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    certificate_id, student_name, course_title, instructor_name, issue_date = inputs
+    styles = _styles()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.leftMargin = doc.rightMargin = doc.topMargin = doc.bottomMargin = 0.75 * inch
+    elements = [
+        Spacer(1, 0.5 * inch),
+        Paragraph("Docebo", styles['header']),
+        Spacer(1, 0.3 * inch),
+        Paragraph("Certificate of Completion", styles['title']),
+        Spacer(1, 0.2 * inch),
+        Paragraph("This is to certify that", styles['normal']),
+        Paragraph(student_name, styles['normal']),
+        Paragraph("has successfully completed the course", styles['normal']),
+        Paragraph(course_title, styles['normal']),
+        Spacer(1, 0.2 * inch),
+        Paragraph(f"Instructor: {instructor_name}", styles['normal']),
+        Spacer(1, 0.2 * inch),
+        Paragraph(f"Date of Issue: {issue_date}", styles['small']),
+        Paragraph(f"Certificate ID: {certificate_id}", styles['small']),
+        Spacer(1, 0.5 * inch),
+        Paragraph(instructor_name, styles['signature']),
+        Paragraph("Instructor", styles['small']),
+    ]
+    doc.build(elements, onFirstPage=_draw_page_frame, onLaterPages=_draw_page_frame)
+    return buffer.getvalue()
+
+
+def render_certificate(certificate):
+    return render_pdf(_inputs(certificate))
+
+
+def store_pdf(digest, pdf):
+    path = certificate_path(digest)
+    if not default_storage.exists(path):
+        saved = default_storage.save(path, ContentFile(pdf))
+        if saved != path:
+            # Another process stored the same PDF first.
+            default_storage.delete(saved)
+    return path
+
+
+def ensure_rendered(certificate):
+    """Return ``(digest, path)`` of the stored PDF, rendering it if needed.
+
+    PDFs are stored under MEDIA_ROOT by the digest of their inputs, so a
+    certificate is only rendered again when one of those inputs changes.
+    """
+    digest = certificate_digest(certificate)
+    path = certificate_path(digest)
+    if not default_storage.exists(path):
+        store_pdf(digest, render_certificate(certificate))
+    if certificate.rendered_digest != digest:
+        Certificate.objects.filter(pk=certificate.pk).update(rendered_digest=digest)
+        certificate.rendered_digest = digest
+    return digest, path
+
+
+def pending_certificates(queryset, since=None):
+    """Completed certificates in ``queryset`` whose stored PDF is missing or stale.
+
+    With ``since``, only certificates updated since then are looked at, so a
+    poll costs what changed rather than every certificate ever issued.
+    Completing a certificate updates it, so none is missed by a poll after a
+    full pass. A PDF made stale by renaming the student, course or instructor
+    is then left to ``ensure_rendered()`` on the next download.
+    """
+    certificates = queryset.filter(is_completed=True)
+    if since is not None:
+        certificates = certificates.filter(updated_at__gte=since)
+    certificates = certificates.select_related('student', 'course__instructor')
+    return [
+        certificate for certificate in certificates.order_by('id')
+        if certificate.rendered_digest != certificate_digest(certificate)
+    ]
+
+
+def render_pending(queryset, workers=None, batch_size=100, since=None):
+    """Render the pending certificates of ``queryset`` in a process pool.
+
+    ``since`` is passed on to ``pending_certificates()``. Returns the number
+    of certificates rendered.
+    """
+    pending = pending_certificates(queryset, since=since)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            pdfs = pool.map(render_pdf, [_inputs(certificate) for certificate in batch])
+            for certificate, pdf in zip(batch, pdfs):
+                certificate.rendered_digest = certificate_digest(certificate)
+                store_pdf(certificate.rendered_digest, pdf)
+            Certificate.objects.bulk_update(batch, ['rendered_digest'])
+    return len(pending)
+
+
+def write_course_archive(course, output):
+    """Write every completed certificate of ``course`` to ``output`` as a ZIP.
+
+    Entries are copied one at a time, so ``output`` may be an unseekable
+    stream such as stdout.
+    """
+    certificates = Certificate.objects.filter(course=course, is_completed=True).select_related('student', 'course__instructor')
+    count = 0
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for certificate in certificates.order_by('id'):
+            digest, path = ensure_rendered(certificate)
+            with default_storage.open(path) as source, archive.open(f'certificate_{certificate.id}_{certificate.student.username}.pdf', 'w') as target:
+                shutil.copyfileobj(source, target)
+            count += 1
+    return count
\ No newline at end of file
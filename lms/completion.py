@@ -0,0 +1,169 @@
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from .models import Course, Enrollment, Lesson, LessonProgress, Quiz, Assignment, Submission, QuizAttempt, Certificate, CourseProgress
+
+COUNTERS = ('lessons_viewed', 'assignments_submitted', 'quizzes_passed')
+
+
+def is_course_completed(student, course):
+    progress = CourseProgress.objects.filter(student=student, course=course).first()
+    return (progress or CourseProgress()).is_complete(course)
+
+
+def adjust_progress(student_id, course_id, counter, delta):
+    """Apply ``delta`` to one counter of a student's course progress."""
+    with transaction.atomic():
+        CourseProgress.objects.get_or_create(student_id=student_id, course_id=course_id)
+        CourseProgress.objects.filter(student_id=student_id, course_id=course_id).update(
+            **{counter: F(counter) + delta}, updated_at=timezone.now()
+        )
+        if delta > 0:
+            mark_completed([course_id], student_id=student_id)
+
+
+def mark_completed(course_ids, student_id=None):
+    """Flag the certificates of every student whose progress meets the course totals."""
+    finished = CourseProgress.objects.filter(
+        student_id=OuterRef('student_id'),
+        course_id=OuterRef('course_id'),
+        lessons_viewed__gte=F('course__lesson_count'),
+        assignments_submitted__gte=F('course__assignment_count'),
+    ).filter(Q(course__quiz_count=0) | Q(quizzes_passed__gt=0))
+    certificates = Certificate.objects.filter(course_id__in=course_ids, is_completed=False)
+    if student_id is not None:
+        certificates = certificates.filter(student_id=student_id)
+    return certificates.filter(Exists(finished)).update(is_completed=True, updated_at=timezone.now())
+
+
+def record_lesson_views(views):
+    """Mark ``(student_id, lesson_id)`` pairs as viewed in a few set-based statements.
+
+    The ``lessons_viewed`` counters of the students involved are recounted
+    rather than adjusted and completion is re-evaluated once per course, so
+    applying the same views twice is harmless. Views of deleted lessons are
+    dropped. Returns the number of lessons newly marked as viewed.
+    """
+    views = set(views)
+    lesson_courses = dict(Lesson.objects.filter(id__in={lesson_id for _, lesson_id in views}).values_list('id', 'course_id'))
+    views = {view for view in views if view[1] in lesson_courses}
+    if not views:
+        return 0
+    student_ids = {student_id for student_id, _ in views}
+    course_ids = set(lesson_courses.values())
+    with transaction.atomic():
+        existing = {
+            (student_id, lesson_id): (pk, viewed)
+            for pk, student_id, lesson_id, viewed in LessonProgress.objects.filter(
+                student_id__in=student_ids, lesson_id__in=lesson_courses,
+            ).values_list('id', 'student_id', 'lesson_id', 'viewed')
+        }
+        unviewed = [existing[view][0] for view in views if view in existing and not existing[view][1]]
+        LessonProgress.objects.filter(pk__in=unviewed).update(viewed=True)
+        created = LessonProgress.objects.bulk_create(
+            [LessonProgress(student_id=student_id, lesson_id=lesson_id, viewed=True)
+             for student_id, lesson_id in views if (student_id, lesson_id) not in existing],
+            batch_size=500, ignore_conflicts=True,
+        )
+
+        counts = _counts_by_course_and_student(
+            LessonProgress.objects.filter(lesson__course_id__in=course_ids, student_id__in=student_ids, viewed=True),
+            'lesson__course_id', 'lesson_id',
+        )
+        keys = {(lesson_courses[lesson_id], student_id) for student_id, lesson_id in views}
+        progress = {
+            (row.course_id, row.student_id): row
+            for row in CourseProgress.objects.filter(course_id__in=course_ids, student_id__in=student_ids)
+        }
+        now = timezone.now()
+        stale = []
+        for key in keys & set(progress):
+            row = progress[key]
+            if row.lessons_viewed != counts.get(key, 0):
+                row.lessons_viewed = counts.get(key, 0)
+                row.updated_at = now
+                stale.append(row)
+        CourseProgress.objects.bulk_update(stale, ['lessons_viewed', 'updated_at'], batch_size=500)
+        CourseProgress.objects.bulk_create(
+            [CourseProgress(course_id=key[0], student_id=key[1], lessons_viewed=counts.get(key, 0))
+             for key in keys - set(progress)],
+            batch_size=500, ignore_conflicts=True,
+        )
+        mark_completed(course_ids)
+    return len(unviewed) + len(created)
+
+
+def _counts_by_course(queryset):
+    return dict(
+        queryset.values('course_id').annotate(total=Count('id')).values_list('course_id', 'total')
+    )
+
+
+def _counts_by_course_and_student(queryset, course_field, counted_field):
+    rows = queryset.values(course_field, 'student_id').annotate(
+        total=Count(counted_field, distinct=True)
+    ).values_list(course_field, 'student_id', 'total')
+    return {(course_id, student_id): total for course_id, student_id, total in rows}
+
+
+def rebuild_progress(course_ids, dry_run=False):
+    """Recompute course totals and student counters from the source tables.
+
+    Returns ``(courses_fixed, progress_fixed)``, the number of rows whose
+    stored counters had drifted from the source tables.
+    """
+    totals = {
+        'lesson_count': _counts_by_course(Lesson.objects.filter(course_id__in=course_ids)),
+        'assignment_count': _counts_by_course(Assignment.objects.filter(course_id__in=course_ids)),
+        'quiz_count': _counts_by_course(Quiz.objects.filter(course_id__in=course_ids)),
+    }
+    stale_courses = []
+    for course in Course.objects.filter(pk__in=course_ids).only('id', *totals):
+        expected = {field: counts.get(course.id, 0) for field, counts in totals.items()}
+        if any(getattr(course, field) != value for field, value in expected.items()):
+            for field, value in expected.items():
+                setattr(course, field, value)
+            stale_courses.append(course)
+
+    counters = {
+        'lessons_viewed': _counts_by_course_and_student(
+            LessonProgress.objects.filter(lesson__course_id__in=course_ids, viewed=True),
+            'lesson__course_id', 'lesson_id',
+        ),
+        'assignments_submitted': _counts_by_course_and_student(
+            Submission.objects.filter(assignment__course_id__in=course_ids),
+            'assignment__course_id', 'assignment_id',
+        ),
+        'quizzes_passed': _counts_by_course_and_student(
+            QuizAttempt.objects.filter(quiz__course_id__in=course_ids, passed=True),
+            'quiz__course_id', 'quiz_id',
+        ),
+    }
+    existing = {
+        (progress.course_id, progress.student_id): progress
+        for progress in CourseProgress.objects.filter(course_id__in=course_ids)
+    }
+    keys = set(existing).union(
+        Enrollment.objects.filter(course_id__in=course_ids).values_list('course_id', 'student_id'),
+        *counters.values(),
+    )
+    missing, stale = [], []
+    for key in keys:
+        expected = {field: counts.get(key, 0) for field, counts in counters.items()}
+        progress = existing.get(key)
+        if progress is None:
+            missing.append(CourseProgress(course_id=key[0], student_id=key[1], **expected))
+        elif any(getattr(progress, field) != value for field, value in expected.items()):
+            for field, value in expected.items():
+                setattr(progress, field, value)
+            progress.updated_at = timezone.now()
+            stale.append(progress)
+
+    if not dry_run:
+        with transaction.atomic():
+            Course.objects.bulk_update(stale_courses, list(totals), batch_size=500)
+            CourseProgress.objects.bulk_create(missing, batch_size=500)
+            CourseProgress.objects.bulk_update(stale, [*COUNTERS, 'updated_at'], batch_size=500)
+            mark_completed(course_ids)
+    return len(stale_courses), len(missing) + len(stale)
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""Streaming import and export of course trees.
+
+A course record is a dict shaped like::
+
+    {"title": ..., "description": ..., "instructor": "<username>",
+     "lessons": [{"title": ..., "video_url": ...}],
+     "quizzes": [{"title": ..., "questions": [
+         {"text": ..., "option1": ..., "option2": ..., "option3": ...,
+          "option4": ..., "correct_option": 1}]}],
+     "assignments": [{"title": ..., "description": ...}]}
+
+JSON Lines files hold one record per line. CSV files hold one row per
+object, with a ``type`` column; lessons, quizzes and assignments belong to
+the course row above them and questions to the quiz row above them.
+"""
+import csv
+import json
+from collections import defaultdict
+from itertools import chain
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .models import Course, Lesson, Quiz, Question, Assignment
+from .search import index_objects
+
+CSV_FIELDS = ['type', 'title', 'description', 'instructor', 'video_url', 'text',
+              'option1', 'option2', 'option3', 'option4', 'correct_option']
+QUESTION_FIELDS = ['text', 'option1', 'option2', 'option3', 'option4', 'correct_option']
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream):
+    course = quiz = None
+    for line_number, row in enumerate(csv.DictReader(stream), start=2):
+        kind = row['type']
+        if kind == 'course':
+            if course is not None:
+                yield course
+            course = {'title': row['title'], 'description': row['description'], 'instructor': row['instructor'],
+                      'lessons': [], 'quizzes': [], 'assignments': []}
+            quiz = None
+        elif course is None:
+            raise ValueError(f'Line {line_number}: {kind} row before any course row.')
+        elif kind == 'lesson':
+            course['lessons'].append({'title': row['title'], 'video_url': row['video_url']})
+        elif kind == 'quiz':
+            quiz = {'title': row['title'], 'questions': []}
+            course['quizzes'].append(quiz)
+        elif kind == 'question' and quiz is not None:
+            quiz['questions'].append({field: row[field] for field in QUESTION_FIELDS})
+        elif kind == 'assignment':
+            course['assignments'].append({'title': row['title'], 'description': row['description']})
+        else:
+            raise ValueError(f'Line {line_number}: unexpected {kind!r} row.')
+    if course is not None:
+        yield course
+
+
+def write_jsonl(stream, records):
+    for record in records:
+        stream.write(json.dumps(record) + '\n')
+
+
+def write_csv(stream, records):
+    writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, restval='')
+    writer.writeheader()
+    for record in records:
+        writer.writerow({'type': 'course', 'title': record['title'], 'description': record['description'],
+                         'instructor': record['instructor']})
+        for lesson in record['lessons']:
+            writer.writerow({'type': 'lesson', **lesson})
+        for quiz in record['quizzes']:
+            writer.writerow({'type': 'quiz', 'title': quiz['title']})
+            for question in quiz['questions']:
+                writer.writerow({'type': 'question', **question})
+        for assignment in record['assignments']:
+            writer.writerow({'type': 'assignment', **assignment})
+
+
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+
+
+def batches(records, size):
+    """Yield lists of up to ``size`` items from the iterable ``records``."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _import_batch(records, default_instructor):
+    usernames = {record.get('instructor') or default_instructor for record in records}
+    instructors = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+    missing = usernames - set(instructors)
+    if missing:
+        raise ValueError(f"Unknown instructor(s): {', '.join(sorted(map(str, missing)))}.")
+
+    courses = Course.objects.bulk_create(
+        Course(
+            title=record['title'],
+            description=record.get('description', ''),
+            instructor_id=instructors[record.get('instructor') or default_instructor],
+            # bulk_create skips the signals that keep these totals up to date.
+            lesson_count=len(record.get('lessons', [])),
+            assignment_count=len(record.get('assignments', [])),
+            quiz_count=len(record.get('quizzes', [])),
+        )
+        for record in records
+    )
+    pairs = list(zip(courses, records))
+    lessons = [
+        Lesson(course=course, title=lesson['title'], video_url=lesson['video_url'])
+        for course, record in pairs for lesson in record.get('lessons', [])
+    ]
+    for lesson in lessons:
+        lesson.normalize_video()
+    Lesson.objects.bulk_create(lessons)
+    assignments = Assignment.objects.bulk_create(
+        Assignment(course=course, title=assignment['title'], description=assignment.get('description', ''))
+        for course, record in pairs for assignment in record.get('assignments', [])
+    )
+    quiz_records = [quiz for record in records for quiz in record.get('quizzes', [])]
+    quizzes = Quiz.objects.bulk_create(
+        Quiz(course=course, title=quiz['title'])
+        for course, record in pairs for quiz in record.get('quizzes', [])
+    )
+    questions = Question.objects.bulk_create(
+        Question(quiz=quiz, **{field: question[field] for field in QUESTION_FIELDS})
+        for quiz, quiz_record in zip(quizzes, quiz_records) for question in quiz_record.get('questions', [])
+    )
+    # bulk_create skips the signals that keep the search index in sync too.
+    index_objects(chain(courses, lessons, assignments))
+    return {'courses': len(courses), 'lessons': len(lessons), 'quizzes': len(quizzes),
+            'questions': len(questions), 'assignments': len(assignments)}
+
+
+def import_records(records, batch_size=200, default_instructor=None, progress=None):
+    """Create course trees from ``records`` with one transaction per batch of courses.
+
+    ``progress``, if given, is called with the running totals after every
+    batch. Returns the final totals.
+    """
+    totals = defaultdict(int)
+    for batch in batches(records, batch_size):
+        with transaction.atomic():
+            counts = _import_batch(batch, default_instructor)
+        for name, count in counts.items():
+            totals[name] += count
+        if progress:
+            progress(totals)
+    return dict(totals)
+
+
+def _group(queryset, key):
+    grouped = defaultdict(list)
+    for item in queryset.order_by('id'):
+        grouped[getattr(item, key)].append(item)
+    return grouped
+
+
+def export_records(courses, batch_size=200):
+    """Yield course records for ``courses``, loading content one batch at a time."""
+    courses = courses.select_related('instructor').order_by('id')
+    last_id = 0
+    while True:
+        batch = list(courses.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        last_id = batch[-1].id
+        ids = [course.id for course in batch]
+        lessons = _group(Lesson.objects.filter(course_id__in=ids), 'course_id')
+        assignments = _group(Assignment.objects.filter(course_id__in=ids), 'course_id')
+        quizzes = _group(Quiz.objects.filter(course_id__in=ids), 'course_id')
+        questions = _group(Question.objects.filter(quiz__course_id__in=ids), 'quiz_id')
+        for course in batch:
+            yield {
+                'title': course.title,
+                'description': course.description,
+                'instructor': course.instructor.username,
+                'lessons': [{'title': lesson.title, 'video_url': lesson.video_url} for lesson in lessons[course.id]],
+                'quizzes': [
+                    {
+                        'title': quiz.title,
+                        'questions': [
+                            {field: getattr(question, field) for field in QUESTION_FIELDS}
+                            for question in questions[quiz.id]
+                        ],
+                    }
+                    for quiz in quizzes[course.id]
+                ],
+                'assignments': [
+                    {'title': assignment.title, 'description': assignment.description}
+                    for assignment in assignments[course.id]
+                ],
+            }
\ No newline at end of file
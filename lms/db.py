@@ -0,0 +1,199 @@
+"""Database profiles, connection tuning and read-replica routing.
+
+``database_config()`` builds ``DATABASES`` from the environment:
+
+* ``LMS_DB_PROFILE=sqlite`` (default): ``LMS_DB_NAME`` (default
+  ``BASE_DIR / 'db.sqlite3'``). With ``LMS_DB_REPLICA`` set to a file path, a
+  ``replica`` alias reads that file, a copy of the primary refreshed by
+  ``manage.py sync_replica``.
+* ``LMS_DB_PROFILE=postgres``: ``LMS_DB_NAME``, ``LMS_DB_USER``,
+  ``LMS_DB_PASSWORD``, ``LMS_DB_HOST`` and ``LMS_DB_PORT``, plus
+  ``LMS_DB_REPLICA_HOST`` for a streaming replica. Needs ``psycopg``.
+
+Connections are kept for ``LMS_DB_CONN_MAX_AGE`` seconds (default 60) in
+both profiles. Every new SQLite connection gets ``LMS_SQLITE_PRAGMAS``
+(default: WAL journal, ``synchronous=NORMAL`` and a 5 second busy
+timeout), so readers no longer wait for writers.
+
+Views decorated with ``@read_replica`` send their reads to the replica
+through ``ReplicaRouter``. ``PrimaryAfterWriteMiddleware`` keeps a browser
+on the primary for ``LMS_REPLICA_PIN_SECONDS`` (default 10) after any
+request of it that wrote to the database, whatever its method, so users see
+their own writes. Persistent connections to a SQLite replica are reopened
+when ``sync_replica`` has replaced the file since they were opened.
+"""
+import asyncio
+import os
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA = 'replica'
+PIN_COOKIE = 'lms_primary'
+DEFAULT_SQLITE_PRAGMAS = {'journal_mode': 'wal', 'synchronous': 'normal', 'busy_timeout': 5000}
+
+_use_replica = ContextVar('lms_use_replica', default=False)
+# Labels of the models the current request wrote, collected by the router.
+# A mutable set, so writes made in a copied context (sync_to_async) count too.
+_writes = ContextVar('lms_writes', default=None)
+
+
+def database_config(base_dir, environ=os.environ):
+    """Return ``DATABASES`` for the profile named by ``LMS_DB_PROFILE``; see the module docstring."""
+    profile = environ.get('LMS_DB_PROFILE', 'sqlite')
+    common = {
+        'CONN_MAX_AGE': int(environ.get('LMS_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+    if profile == 'sqlite':
+        databases = {'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('LMS_DB_NAME') or os.path.join(base_dir, 'db.sqlite3'),
+            **common,
+        }}
+        if environ.get('LMS_DB_REPLICA'):
+            databases[REPLICA] = {**databases['default'], 'NAME': environ['LMS_DB_REPLICA']}
+    elif profile == 'postgres':
+        databases = {'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': environ.get('LMS_DB_NAME', 'lms'),
+            'USER': environ.get('LMS_DB_USER', ''),
+            'PASSWORD': environ.get('LMS_DB_PASSWORD', ''),
+            'HOST': environ.get('LMS_DB_HOST', ''),
+            'PORT': environ.get('LMS_DB_PORT', ''),
+            **common,
+        }}
+        if environ.get('LMS_DB_REPLICA_HOST'):
+            databases[REPLICA] = {**databases['default'], 'HOST': environ['LMS_DB_REPLICA_HOST']}
+    else:
+        raise ValueError(f'Unknown LMS_DB_PROFILE {profile!r}; use sqlite or postgres.')
+    if REPLICA in databases:
+        # Tests read and write one database.
+        databases[REPLICA]['TEST'] = {'MIRROR': 'default'}
+    return databases
+
+
+def configure_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver that applies ``LMS_SQLITE_PRAGMAS``."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'LMS_SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+    for name, value in pragmas.items():
+        # The replica file is replaced whole by sync_replica, which a WAL
+        # file left next to it would corrupt.
+        if name == 'journal_mode' and connection.alias == REPLICA:
+            continue
+        # On the driver connection, so request query counts leave it out.
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+    if connection.alias == REPLICA:
+        connection.lms_replica_inode = _inode(connection.settings_dict['NAME'])
+
+
+def _inode(path):
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def close_replaced_replica(**kwargs):
+    """``request_started`` receiver that closes a persistent connection to a replaced replica file.
+
+    ``sync_replica`` renames a new copy over the file, and an open SQLite
+    connection keeps reading the old one.
+    """
+    if REPLICA not in settings.DATABASES:
+        return
+    connection = connections[REPLICA]
+    inode = getattr(connection, 'lms_replica_inode', None)
+    if connection.connection is not None and inode is not None \
+            and _inode(connection.settings_dict['NAME']) != inode:
+        connection.close()
+
+
+def estimated_count(model, using='default'):
+    """A cheap estimate of the number of rows in ``model``'s table, or ``None``.
+
+    PostgreSQL's planner statistics (``None`` until the table was first
+    analyzed); on SQLite the largest rowid, which overcounts deleted rows.
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'SELECT MAX(rowid) FROM {table}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class ReplicaRouter:
+    """Send the reads of ``@read_replica`` views to the ``replica`` alias, if configured."""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and REPLICA in settings.DATABASES:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None:
+            writes.add(model._meta.label)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
+
+
+def read_replica(view):
+    """Let ``view`` read from the replica unless the client wrote recently."""
+    if asyncio.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _use_replica.set(PIN_COOKIE not in request.COOKIES)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _use_replica.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _use_replica.set(PIN_COOKIE not in request.COOKIES)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+class PrimaryAfterWriteMiddleware:
+    """Pin clients that just wrote to the primary; see the module docstring.
+
+    Place it above ``SessionMiddleware`` so session saves count as writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = set()
+        token = _writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _writes.reset(token)
+        if writes:
+            response.set_cookie(PIN_COOKIE, '1', max_age=getattr(settings, 'LMS_REPLICA_PIN_SECONDS', 10),
+                                httponly=True, samesite='Lax')
+        return response
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.db.models import Count
+
+# Model name -> fields that identify a row once duplicates are merged.
+UNIQUE_KEYS = {
+    'Enrollment': ('student', 'course'),
+    'Certificate': ('student', 'course'),
+    'LessonProgress': ('student', 'lesson'),
+    'Submission': ('assignment', 'student'),
+}
+
+
+def _merge_certificates(rows):
+    keep = rows[0]
+    if any(row.is_completed for row in rows) and not keep.is_completed:
+        keep.is_completed = True
+        keep.save(update_fields=['is_completed', 'updated_at'])
+    return keep
+
+
+def _merge_lesson_progress(rows):
+    keep = rows[0]
+    if any(row.viewed for row in rows) and not keep.viewed:
+        keep.viewed = True
+        keep.save(update_fields=['viewed'])
+    return keep
+
+
+def _merge_submissions(rows):
+    # The most recent upload is the one that counts.
+    return max(rows, key=lambda row: (row.submitted_at, row.id))
+
+
+MERGERS = {
+    'Enrollment': lambda rows: rows[0],
+    'Certificate': _merge_certificates,
+    'LessonProgress': _merge_lesson_progress,
+    'Submission': _merge_submissions,
+}
+
+
+def merge_duplicates(get_model):
+    """Collapse rows that share one of the ``UNIQUE_KEYS`` into a single row.
+
+    ``get_model`` is ``apps.get_model`` from the app registry; migration 0006
+    has its own copy for the historical models. Returns the number of rows
+    removed per model.
+    """
+    removed = {}
+    for name, fields in UNIQUE_KEYS.items():
+        model = get_model('lms', name)
+        key = [f'{field}_id' for field in fields]
+        groups = model.objects.values(*key).annotate(rows=Count('id')).filter(rows__gt=1).values_list(*key)
+        removed[name] = 0
+        for values in list(groups):
+            rows = list(model.objects.filter(**dict(zip(key, values))).order_by('id'))
+            keep = MERGERS[name](rows)
+            stale = [row.pk for row in rows if row.pk != keep.pk]
+            model.objects.filter(pk__in=stale).delete()
+            removed[name] += len(stale)
+    return removed
\ No newline at end of file
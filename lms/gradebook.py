@@ -0,0 +1,202 @@
+"""Gradebook export: one row per enrolled student with their progress in a course.
+
+``gradebook_rows()`` walks the enrollments with a server-side cursor
+(``QuerySet.iterator()``) and looks up quiz scores and submissions one chunk
+of students at a time, so memory use stays flat however many students are
+enrolled. ``stream_csv()`` and ``stream_xlsx()`` turn the rows into chunks
+of bytes for a ``StreamingHttpResponse`` or a file.
+"""
+import csv
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.db.models import F, FilteredRelation, Q
+
+from .course_io import batches
+from .models import Enrollment, Quiz, Assignment, Submission
+from .progress import best_scores
+
+CHUNK_SIZE = 1000
+
+
+def gradebook_header(quizzes, assignments):
+    return [
+        'username', 'email', 'enrolled_at', 'lessons_viewed', 'lessons_total',
+        *(f'quiz: {quiz.title}' for quiz in quizzes), 'quizzes_passed',
+        *(f'assignment: {assignment.title}' for assignment in assignments), 'assignments_submitted',
+        'completed',
+    ]
+
+
+def gradebook_rows(course, chunk_size=CHUNK_SIZE):
+    """Yield the header and then one row per student enrolled in ``course``, by username.
+
+    Quiz columns hold the student's best score in percent, assignment
+    columns the time of their submission; both are empty when there is none.
+    """
+    quizzes = list(Quiz.objects.filter(course=course).order_by('id').only('id', 'title'))
+    assignments = list(Assignment.objects.filter(course=course).order_by('id').only('id', 'title'))
+    yield gradebook_header(quizzes, assignments)
+    enrollments = Enrollment.objects.filter(course=course).annotate(
+        own_progress=FilteredRelation('course__progress', condition=Q(course__progress__student_id=F('student_id'))),
+        own_certificate=FilteredRelation('course__certificate',
+                                         condition=Q(course__certificate__student_id=F('student_id'))),
+    ).order_by('student__username').values_list(
+        'student_id', 'student__username', 'student__email', 'enrolled_at', 'own_progress__lessons_viewed',
+        'own_progress__quizzes_passed', 'own_progress__assignments_submitted', 'own_certificate__is_completed',
+    )
+    for chunk in batches(enrollments.iterator(chunk_size=chunk_size), chunk_size):
+        student_ids = [row[0] for row in chunk]
+        scores = {
+            (quiz_id, student_id): best
+            for quiz_id, student_id, best in best_scores([course.id]).filter(student_id__in=student_ids)
+        }
+        submitted = {
+            (assignment_id, student_id): submitted_at
+            for assignment_id, student_id, submitted_at in Submission.objects.filter(
+                assignment__course_id=course.id, student_id__in=student_ids,
+            ).values_list('assignment_id', 'student_id', 'submitted_at')
+        }
+        for student_id, username, email, enrolled_at, lessons, passed, submissions, completed in chunk:
+            yield [
+                username, email, _timestamp(enrolled_at), lessons or 0, course.lesson_count,
+                *(_score(scores.get((quiz.id, student_id))) for quiz in quizzes), passed or 0,
+                *(_timestamp(submitted.get((assignment.id, student_id))) for assignment in assignments),
+                submissions or 0, bool(completed),
+            ]
+
+
+def _score(best):
+    return '' if best is None else round(best, 1)
+
+
+def _timestamp(value):
+    return '' if value is None else value.isoformat(timespec='seconds')
+
+
+# Spreadsheets evaluate a CSV cell starting with one of these as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows, rows_per_chunk=500):
+    """Yield ``rows`` as UTF-8 CSV, ``rows_per_chunk`` rows at a time.
+
+    Text that a spreadsheet would run as a formula (a username such as
+    ``=HYPERLINK(...)``) is prefixed with ``'``.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(map(_csv_cell, row))
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+class _Sink:
+    """An unseekable file that hands back whatever was written to it since the last ``take()``."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+# The smallest set of parts Excel and LibreOffice open: one worksheet of
+# inline strings, no shared strings or styles.
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Gradebook" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+SHEET_HEAD = (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+              b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+SHEET_TAIL = b'</sheetData></worksheet>'
+# Characters XML 1.0 does not allow, even escaped.
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+def _xlsx_cell(value):
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    if value == '':
+        return '<c/>'
+    # An inline string is never evaluated, whatever it starts with.
+    text = escape(_INVALID_XML.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def stream_xlsx(rows, rows_per_chunk=500):
+    """Yield ``rows`` as a single-sheet XLSX workbook, ``rows_per_chunk`` rows at a time.
+
+    The archive is written to an unseekable sink, so nothing but the
+    compressor's window is held back between chunks.
+    """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(SHEET_HEAD)
+            for count, row in enumerate(rows, start=1):
+                sheet.write(f"<row>{''.join(map(_xlsx_cell, row))}</row>".encode())
+                if count % rows_per_chunk == 0:
+                    yield sink.take()
+            sheet.write(SHEET_TAIL)
+    yield sink.take()
+
+
+FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'xlsx': (stream_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
\ No newline at end of file
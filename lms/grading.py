@@ -0,0 +1,60 @@
+import operator
+from array import array
+
+from django.db import transaction
+
+from .models import Question, QuizAttempt, AttemptAnswer
+from .structure import structure_cache
+
+PASS_MARK = 0.7
+
+
+def _cache_key(quiz):
+    return f'lms:answer_key:{quiz.id}:{quiz.course.structure_version}'
+
+
+def answer_key(quiz):
+    """Return ``(question_ids, correct_options)`` for a quiz.
+
+    ``correct_options`` is a ``bytes`` string holding one option number per
+    question, aligned with ``question_ids``. The key is cached under the
+    course's ``structure_version``, which the signals bump whenever a question
+    changes, so no worker grades against an old key; see ``lms.structure``.
+    """
+    cache = structure_cache()
+    key = cache.get(_cache_key(quiz))
+    if key is None:
+        rows = Question.objects.filter(quiz_id=quiz.id).order_by('id').values_list('id', 'correct_option')
+        key = (array('q', (row[0] for row in rows)), bytes(row[1] for row in rows))
+        cache.set(_cache_key(quiz), key, None)
+    return key
+
+
+def _selected_option(value):
+    try:
+        option = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return option if 1 <= option <= 4 else 0
+
+
+def record_attempt(student, quiz, data):
+    """Grade the answers in ``data`` (a POST dict) and store the attempt."""
+    question_ids, correct = answer_key(quiz)
+    selected = bytes(_selected_option(data.get(f'question_{question_id}')) for question_id in question_ids)
+    results = list(map(operator.eq, selected, correct))
+    score = sum(results)
+    total = len(question_ids)
+    with transaction.atomic():
+        attempt = QuizAttempt.objects.create(
+            student=student,
+            quiz=quiz,
+            score=score,
+            total=total,
+            passed=total > 0 and score / total >= PASS_MARK,
+        )
+        AttemptAnswer.objects.bulk_create(
+            AttemptAnswer(attempt=attempt, question_id=question_id, selected_option=option, is_correct=is_correct)
+            for question_id, option, is_correct in zip(question_ids, selected, results)
+        )
+    return attempt
\ No newline at end of file
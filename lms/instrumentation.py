@@ -0,0 +1,140 @@
+"""Opt-in per-request query instrumentation.
+
+Add ``'lms.instrumentation.QueryInstrumentationMiddleware'`` at the top of
+``MIDDLEWARE`` to get, for every request, the number of queries, repeated
+statements, database time and template render time. They are reported in the
+``X-Query-Count``, ``X-Query-Budget`` and ``Server-Timing`` response headers
+and as one JSON log line on the ``lms.queries`` logger. Views declare their
+budget with ``@query_budget``; with ``LMS_QUERY_BUDGET_STRICT = True`` (meant
+for test settings) a request that goes over it raises ``QueryBudgetExceeded``.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger('lms.queries')
+
+_current = ContextVar('lms_request_stats', default=None)
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(limit):
+    """Declare the most queries a request to the decorated view may issue."""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def fingerprint(sql):
+    # Statements only differ in the length of their IN lists once the
+    # parameters are left out.
+    return _IN_LIST.sub('(...)', sql)
+
+
+class RequestStats:
+    def __init__(self):
+        self.fingerprints = Counter()
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+    @property
+    def query_count(self):
+        return sum(self.fingerprints.values())
+
+    def repeated(self, threshold=2):
+        return {sql: count for sql, count in self.fingerprints.items() if count >= threshold}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.fingerprints[fingerprint(sql)] += 1
+
+
+def _instrument_templates():
+    if getattr(Template.render, 'instrumented', False):
+        return
+    original = Template.render
+
+    @wraps(original)
+    def render(self, context):
+        stats = _current.get()
+        # Included templates are already covered by the outermost render.
+        if stats is None or stats.rendering:
+            return original(self, context)
+        stats.rendering = True
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            stats.template_time += time.perf_counter() - started
+            stats.rendering = False
+
+    render.instrumented = True
+    Template.render = render
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        _instrument_templates()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, stats)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, 'query_budget', None)
+
+    def report(self, request, response, stats):
+        budget = getattr(request, 'query_budget', None)
+        match = getattr(request, 'resolver_match', None)
+        repeated = stats.repeated(getattr(settings, 'LMS_QUERY_REPEAT_THRESHOLD', 3))
+        response['X-Query-Count'] = str(stats.query_count)
+        if budget is not None:
+            response['X-Query-Budget'] = str(budget)
+        response['Server-Timing'] = (
+            f'db;dur={stats.db_time * 1000:.1f};desc="{stats.query_count} queries", '
+            f'tpl;dur={stats.template_time * 1000:.1f}'
+        )
+        over_budget = budget is not None and stats.query_count > budget
+        logger.log(logging.WARNING if over_budget or repeated else logging.INFO, json.dumps({
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': stats.query_count,
+            'budget': budget,
+            'db_ms': round(stats.db_time * 1000, 2),
+            'template_ms': round(stats.template_time * 1000, 2),
+            'repeated': repeated,
+        }))
+        if over_budget and getattr(settings, 'LMS_QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(
+                f'{match.view_name if match else request.path} ran {stats.query_count} queries, budget is {budget}.'
+            )
\ No newline at end of file
@@ -0,0 +1,71 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# "import time: self [us] | cumulative | imported package", the package
+# indented by two spaces per level of nesting.
+IMPORT_TIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def subprocess_env():
+    """Environment for a fresh interpreter that finds the project and its settings."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [sys.path[0], env.get('PYTHONPATH')]))
+    return env
+
+
+def import_times(modules):
+    """Import Django, the apps and ``modules`` in a new interpreter; return ``[(module, self_us, cumulative_us, depth)]``."""
+    code = 'import importlib, django; django.setup(); ' + '; '.join(
+        f'importlib.import_module({module!r})' for module in modules)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=subprocess_env(),
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise CommandError(result.stderr.strip().splitlines()[-1])
+    times = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            times.append((module, int(own), int(cumulative), len(indent) // 2))
+    return times
+
+
+class Command(BaseCommand):
+    help = ('Import the apps and the URLconf in a fresh interpreter under "python -X importtime" and list the '
+            'slowest modules and packages. With --budget-ms, fail if the imports take longer than that.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', action='append', dest='modules',
+                            help='Module to import after setup (default: ROOT_URLCONF). Repeatable.')
+        parser.add_argument('--package', help='Only list modules of this package, e.g. lms or reportlab.')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--budget-ms', type=float)
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [settings.ROOT_URLCONF]
+        times = import_times(modules)
+        total = sum(own for _, own, _, _ in times) / 1000
+        by_package = defaultdict(int)
+        for module, own, _, _ in times:
+            by_package[module.partition('.')[0]] += own
+
+        self.stdout.write(f"Imported {len(times)} modules in {total:.1f} ms (django.setup() and {', '.join(modules)}).")
+        self.stdout.write(f"\n{'package':<40} {'self ms':>10}")
+        for package, own in sorted(by_package.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'{package:<40} {own / 1000:>10.1f}')
+
+        package = options['package']
+        if package:
+            times = [entry for entry in times if entry[0] == package or entry[0].startswith(package + '.')]
+        self.stdout.write(f"\n{'module':<40} {'self ms':>10} {'cumulative ms':>14}")
+        for module, own, cumulative, _ in sorted(times, key=lambda entry: -entry[2])[:options['top']]:
+            self.stdout.write(f'{module:<40} {own / 1000:>10.1f} {cumulative / 1000:>14.1f}')
+
+        if options['budget_ms'] is not None and total > options['budget_ms']:
+            raise CommandError(f"Imports took {total:.1f} ms, over the budget of {options['budget_ms']:.0f} ms.")
\ No newline at end of file
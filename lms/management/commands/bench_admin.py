@@ -0,0 +1,85 @@
+import tempfile
+import time
+import types
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.urls import path, reverse
+
+from lms.seeding import Volumes, seed
+
+
+def _urlconf():
+    urlconf = types.ModuleType('bench_admin_urls')
+    urlconf.urlpatterns = [path('admin/', admin.site.urls)]
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = ('Count the queries of the changelist and change form of every lms model in the admin, on a small '
+            'seeded dataset and again after growing it. With --check, fail if any page issues more queries on '
+            'the larger dataset, more than --max-queries or more than --max-kb of HTML, which catches sidebar '
+            'filters that list every course (data is rolled back).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000, help='Students added for the second run.')
+        parser.add_argument('--courses', type=int, default=2000, help='Courses added for the second run.')
+        parser.add_argument('--max-queries', type=int, default=12)
+        parser.add_argument('--max-kb', type=int, default=100)
+        parser.add_argument('--check', action='store_true')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with override_settings(ROOT_URLCONF=_urlconf(), DEBUG=False, MEDIA_ROOT=tempfile.mkdtemp()), \
+                    transaction.atomic():
+                violations = self._run(options)
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+        if options['check'] and violations:
+            raise CommandError('Unbounded admin pages: ' + ', '.join(violations))
+
+    def _pages(self):
+        for model in admin.site._registry:
+            if model._meta.app_label != 'lms':
+                continue
+            name = f'admin:lms_{model._meta.model_name}'
+            yield f'{model.__name__} list', reverse(f'{name}_changelist')
+            latest = model.objects.order_by('-pk').first()
+            if latest is not None:
+                yield f'{model.__name__} change', reverse(f'{name}_change', args=[latest.pk])
+
+    def _measure(self, client):
+        results = {}
+        for name, url in self._pages():
+            client.get(url)
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            status = response.status_code
+            results[name] = (status, len(queries), time.perf_counter() - started, len(response.content))
+        return results
+
+    def _run(self, options):
+        client = Client()
+        client.force_login(User.objects.create_superuser('bench_admin', 'bench_admin@example.com', 'bench'))
+        seed(Volumes(instructors=2, students=20, courses=5), prefix='bench_admin_small')
+        small = self._measure(client)
+        seed(Volumes(instructors=10, students=options['students'], courses=options['courses'], lessons=2),
+             prefix='bench_admin_large')
+        large = self._measure(client)
+
+        violations = []
+        self.stdout.write(f"{'page':<24} {'status':>6} {'small':>6} {'large':>6} {'ms':>7} {'KiB':>6}")
+        for name, (status, queries, elapsed, size) in large.items():
+            before = small.get(name, (None, queries))[1]
+            self.stdout.write(f'{name:<24} {status:>6} {before:>6} {queries:>6} {elapsed * 1000:>7.1f} {size // 1024:>6}')
+            if status != 200 or queries > before or queries > options['max_queries'] \
+                    or size > options['max_kb'] * 1024:
+                violations.append(name)
+        return violations
\ No newline at end of file
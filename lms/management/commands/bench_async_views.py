@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import statistics
+import tempfile
+import threading
+import time
+import types
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import include, path, reverse
+
+from lms import async_views, progress_log, urls
+from lms.models import Course, Enrollment, Profile, Lesson, Quiz, Assignment, Certificate, CourseProgress
+
+
+def _urlconf(read_views):
+    patterns = [
+        path(str(pattern.pattern), getattr(read_views, pattern.name) if pattern.name in async_views.__all__ else pattern.callback,
+             name=pattern.name)
+        for pattern in urls.urlpatterns
+    ]
+    urlconf = types.ModuleType(f'bench_{read_views.__name__}_urls')
+    urlconf.urlpatterns = [path('', include((patterns, 'lms')))]
+    return urlconf
+
+
+class Command(BaseCommand):
+    help = ('Compare the latency and throughput of the sync views under WSGI with their async versions under ASGI. '
+            'Requests go through the real handlers from concurrent threads (WSGI) or tasks (ASGI). '
+            'The fixture is committed, because every thread has its own connection, and deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=10, help='Requests each client sends to every route.')
+        parser.add_argument('--courses', type=int, default=20)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        try:
+            instructor, students, course, lesson = self._seed(options['concurrency'], options['courses'])
+            try:
+                routes = [
+                    ('dashboard', reverse('lms:dashboard'), students),
+                    ('course_list', reverse('lms:course_list'), students),
+                    ('lesson_detail', reverse('lms:lesson_detail', args=[course.id, lesson.id]), students),
+                    ('instructor_dashboard', reverse('lms:instructor_dashboard'), [instructor] * len(students)),
+                ]
+                self.stdout.write(
+                    f"{'route':<22} {'server':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+                )
+                with override_settings(DEBUG=False, LMS_PROGRESS_BUFFER=True, LMS_PROGRESS_LOG_DIR=tempfile.mkdtemp()):
+                    progress_log._recorder = None
+                    for name, url, users in routes:
+                        cookies = [self._session_cookie(user) for user in users]
+                        for server, read_views, run in (('wsgi', urls.views, self._run_wsgi),
+                                                        ('asgi', async_views, self._run_asgi)):
+                            with override_settings(ROOT_URLCONF=_urlconf(read_views)):
+                                elapsed, latencies, errors = run(url, cookies, options['requests'])
+                            latencies.sort()
+                            self.stdout.write(
+                                f'{name:<22} {server:<6} {len(latencies) / elapsed:>8.0f} '
+                                f'{statistics.median(latencies) * 1000:>8.1f} '
+                                f'{latencies[int(len(latencies) * 0.99)] * 1000:>8.1f} {errors:>7}'
+                            )
+                    progress_log.get_recorder().flush()
+            finally:
+                progress_log._recorder = None
+                User.objects.filter(username__startswith='bench_async').delete()
+        finally:
+            teardown_test_environment()
+
+    def _session_cookie(self, user):
+        client = Client()
+        client.force_login(user)
+        return f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    def _run_wsgi(self, url, cookies, count):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        start = threading.Barrier(len(cookies) + 1)
+        latencies, errors = [], []
+
+        def client(cookie):
+            start.wait()
+            for _ in range(count):
+                status = []
+                environ = factory._base_environ(PATH_INFO=url, REQUEST_METHOD='GET', HTTP_COOKIE=cookie)
+                started = time.perf_counter()
+                response = handler(environ, lambda code, headers: status.append(code))
+                b''.join(response)
+                response.close()
+                latencies.append(time.perf_counter() - started)
+                if not status[0].startswith('200'):
+                    errors.append(url)
+
+        threads = [threading.Thread(target=client, args=[cookie]) for cookie in cookies]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started, latencies, len(errors)
+
+    def _run_asgi(self, url, cookies, count):
+        handler = ASGIHandler()
+        latencies, errors = [], []
+
+        async def request(cookie):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+                'path': url, 'raw_path': url.encode(), 'root_path': '', 'query_string': b'',
+                'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+                'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+            }
+            status = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            await handler(scope, receive, send)
+            return status[0]
+
+        async def client(cookie):
+            for _ in range(count):
+                started = time.perf_counter()
+                status = await request(cookie)
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    errors.append(url)
+
+        async def run():
+            started = time.perf_counter()
+            await asyncio.gather(*(client(cookie) for cookie in cookies))
+            return time.perf_counter() - started
+
+        return asyncio.run(run()), latencies, len(errors)
+
+    def _seed(self, students, courses):
+        # Left behind if an earlier run was killed.
+        User.objects.filter(username__startswith='bench_async').delete()
+        instructor = User.objects.create(username='bench_async_instructor')
+        Profile.objects.create(user=instructor, role='instructor')
+        course_rows = Course.objects.bulk_create(
+            Course(title=f'Bench course {i}', description='Benchmark course. ' * 20, instructor=instructor,
+                   lesson_count=5, quiz_count=2, assignment_count=2)
+            for i in range(courses)
+        )
+        lessons = [
+            Lesson(course=course, title=f'Lesson {i}', video_url=f'https://youtu.be/bench{i:06d}')
+            for course in course_rows for i in range(5)
+        ]
+        for lesson in lessons:
+            lesson.normalize_video()
+        Lesson.objects.bulk_create(lessons)
+        Quiz.objects.bulk_create(Quiz(course=course, title=f'Quiz {i}') for course in course_rows for i in range(2))
+        Assignment.objects.bulk_create(
+            Assignment(course=course, title=f'Assignment {i}', description='') for course in course_rows for i in range(2)
+        )
+        users = User.objects.bulk_create(User(username=f'bench_async_student_{i}') for i in range(students))
+        Profile.objects.bulk_create(Profile(user=user, role='student') for user in users)
+        for model in (Enrollment, Certificate, CourseProgress):
+            model.objects.bulk_create(model(student=user, course=course) for user in users for course in course_rows)
+        course = course_rows[0]
+        return instructor, users, course, Lesson.objects.filter(course=course).first()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from lms.seeding import Volumes, seed
+
+# (role of the user requesting it, url name)
+PAGES = [
+    ('student', 'lms:dashboard'),
+    ('student', 'lms:course_list'),
+    ('instructor', 'lms:instructor_dashboard'),
+    ('instructor', 'lms:course_list'),
+]
+
+
+class Command(BaseCommand):
+    help = ('Count the queries of the dashboards and the course catalog for a student enrolled in a few courses '
+            'and for one enrolled in many, and likewise for instructors. With --check, fail if any page issues '
+            'more queries for the larger catalog or more than --max-queries (data is rolled back).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=100, help='Courses seeded for the second run.')
+        parser.add_argument('--enrollments', type=int, default=40, help='Enrollments of the second student.')
+        parser.add_argument('--max-queries', type=int, default=10)
+        parser.add_argument('--check', action='store_true')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with override_settings(DEBUG=False, MEDIA_ROOT=tempfile.mkdtemp()), transaction.atomic():
+                violations = self._run(options)
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+        if options['check'] and violations:
+            raise CommandError('Catalog pages over their query ceiling: ' + ', '.join(violations))
+
+    def _measure(self, prefix):
+        users = {
+            'student': User.objects.get(username=f'{prefix}_student_0'),
+            'instructor': User.objects.get(username=f'{prefix}_instructor_0'),
+        }
+        results = {}
+        for role, url_name in PAGES:
+            client = Client()
+            client.force_login(users[role])
+            counts = []
+            # The first request fills the role and structure caches.
+            for _ in range(2):
+                with CaptureQueriesContext(connection) as queries:
+                    status = client.get(reverse(url_name)).status_code
+                counts.append(len(queries))
+            results[f'{role} {url_name}'] = (status, *counts)
+        return results
+
+    def _run(self, options):
+        seed(Volumes(instructors=1, students=1, courses=3, enrollments=2), prefix='bench_catalog_small')
+        small = self._measure('bench_catalog_small')
+        seed(Volumes(instructors=1, students=1, courses=options['courses'], enrollments=options['enrollments']),
+             prefix='bench_catalog_large')
+        large = self._measure('bench_catalog_large')
+
+        violations = []
+        self.stdout.write(f"{'page':<36} {'status':>6} {'small cold/warm':>16} {'large cold/warm':>16}")
+        for name, (status, cold, warm) in large.items():
+            small_cold, small_warm = small[name][1:]
+            self.stdout.write(f"{name:<36} {status:>6} {f'{small_cold}/{small_warm}':>16} {f'{cold}/{warm}':>16}")
+            if status != 200 or cold > small_cold or warm > small_warm or cold > options['max_queries']:
+                violations.append(name)
+        return violations
\ No newline at end of file
@@ -0,0 +1,64 @@
+import io
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lms.course_io import READERS, WRITERS, export_records, import_records
+from lms.models import Course
+
+
+def synthetic_records(courses, questions, instructor):
+    per_course = max(questions // courses, 1)
+    for c in range(courses):
+        yield {
+            'title': f'Synthetic course {c}',
+            'description': 'Generated for the import benchmark.',
+            'instructor': instructor,
+            'lessons': [{'title': f'Lesson {i}', 'video_url': f'https://youtu.be/video{c}x{i}'} for i in range(10)],
+            'quizzes': [
+                {
+                    'title': f'Quiz {q}',
+                    'questions': [
+                        {'text': f'Question {i}', 'option1': 'A', 'option2': 'B', 'option3': 'C', 'option4': 'D',
+                         'correct_option': i % 4 + 1}
+                        for i in range(per_course // 5)
+                    ],
+                }
+                for q in range(5)
+            ],
+            'assignments': [{'title': 'Assignment', 'description': 'Upload your work.'}],
+        }
+
+
+class Command(BaseCommand):
+    help = 'Time import_courses/export_courses on a synthetic catalog (data is rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=1000)
+        parser.add_argument('--questions', type=int, default=100000)
+        parser.add_argument('--format', choices=sorted(READERS), default='jsonl')
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        file_format = options['format']
+        source = io.StringIO()
+        WRITERS[file_format](source, synthetic_records(options['courses'], options['questions'], 'bench_instructor'))
+        self.stdout.write(f'Synthetic {file_format} file: {source.tell() / 1e6:.1f} MB')
+
+        with transaction.atomic():
+            User.objects.create(username='bench_instructor')
+            source.seek(0)
+            started = time.perf_counter()
+            totals = import_records(READERS[file_format](source), batch_size=options['batch_size'])
+            elapsed = time.perf_counter() - started
+            rows = sum(totals.values())
+            self.stdout.write(f"import: {totals['questions']} questions, {rows} rows in {elapsed:.2f}s "
+                              f"({rows / elapsed:.0f} rows/s)")
+
+            started = time.perf_counter()
+            WRITERS[file_format](io.StringIO(), export_records(Course.objects.all(), batch_size=options['batch_size']))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'export: {rows} rows in {elapsed:.2f}s ({rows / elapsed:.0f} rows/s)')
+            transaction.set_rollback(True)
\ No newline at end of file
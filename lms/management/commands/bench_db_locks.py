@@ -0,0 +1,134 @@
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.test import override_settings
+
+from lms.catalog import catalog_courses
+from lms.db import DEFAULT_SQLITE_PRAGMAS
+from lms.models import Course, Enrollment, Lesson, LessonProgress
+
+MODES = [
+    ('rollback journal, connection per request', {'journal_mode': 'delete'}, False),
+    ('WAL, connection per request', DEFAULT_SQLITE_PRAGMAS, False),
+    ('WAL, persistent connections', DEFAULT_SQLITE_PRAGMAS, True),
+]
+
+
+class Command(BaseCommand):
+    help = ('Run catalog readers against progress writers on SQLite with the old connection setup and with '
+            'LMS_SQLITE_PRAGMAS, with and without persistent connections, and report how long each side waited. '
+            'Every mode runs on its own copy of the database, deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=16)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5.0, help='How long each mode runs.')
+        parser.add_argument('--students', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('bench_db_locks measures SQLite locking; the default database is not SQLite.')
+        directory = tempfile.mkdtemp()
+        try:
+            self.stdout.write(
+                f"{'mode':<42} {'reads/s':>8} {'read p99':>9} {'writes/s':>9} {'write p50':>10} {'write p99':>10} {'locked':>7}"
+            )
+            for name, pragmas, persistent in MODES:
+                alias = f'bench_locks_{len(os.listdir(directory))}'
+                with override_settings(LMS_SQLITE_PRAGMAS=pragmas):
+                    self._create(alias, os.path.join(directory, f'{alias}.sqlite3'), options['students'])
+                    try:
+                        reads, writes, locked = self._run(alias, persistent, options)
+                    finally:
+                        connections[alias].close()
+                        del connections.settings[alias]
+                reads.sort()
+                writes.sort()
+                seconds = options['seconds']
+                self.stdout.write(
+                    f'{name:<42} {len(reads) / seconds:>8.0f} {self._ms(reads, 0.99):>9} {len(writes) / seconds:>9.0f} '
+                    f'{self._ms(writes, 0.5):>10} {self._ms(writes, 0.99):>10} {locked:>7}'
+                )
+        finally:
+            shutil.rmtree(directory)
+
+    def _ms(self, latencies, quantile):
+        if not latencies:
+            return '-'
+        return f'{latencies[min(int(len(latencies) * quantile), len(latencies) - 1)] * 1000:.1f}ms'
+
+    def _create(self, alias, path, students):
+        # A copy of the default database, with the fixture added on top.
+        primary = connections['default']
+        primary.ensure_connection()
+        copy = sqlite3.connect(path)
+        primary.connection.backup(copy)
+        copy.execute('PRAGMA journal_mode = delete')
+        copy.close()
+        connections.settings[alias] = {**connections.settings['default'], 'NAME': path}
+        instructor = User.objects.using(alias).create(username='bench_locks_instructor')
+        courses = Course.objects.using(alias).bulk_create(
+            Course(title=f'Course {i}', description='Benchmark course. ' * 20, instructor=instructor) for i in range(50)
+        )
+        Lesson.objects.using(alias).bulk_create(
+            Lesson(course=courses[0], title=f'Lesson {i}', video_url='https://youtu.be/bench000000') for i in range(20)
+        )
+        users = User.objects.using(alias).bulk_create(User(username=f'bench_locks_{i}') for i in range(students))
+        Enrollment.objects.using(alias).bulk_create(Enrollment(student=user, course=courses[0]) for user in users)
+
+    def _run(self, alias, persistent, options):
+        course_id = Course.objects.using(alias).get(instructor__username='bench_locks_instructor', title='Course 0').id
+        student_ids = list(Enrollment.objects.using(alias).filter(course_id=course_id).values_list('student_id', flat=True))
+        lesson_ids = list(Lesson.objects.using(alias).filter(course_id=course_id).values_list('id', flat=True))
+        connections[alias].close()
+        deadline = time.perf_counter() + options['seconds']
+        start = threading.Barrier(options['readers'] + options['writers'])
+        reads, writes, locked = [], [], []
+
+        def request(action, latencies, seed):
+            rng = random.Random(seed)
+            start.wait()
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        action(rng)
+                    except OperationalError:
+                        locked.append(1)
+                    else:
+                        latencies.append(time.perf_counter() - started)
+                    if not persistent:
+                        connections[alias].close()
+            finally:
+                connections[alias].close()
+
+        def read(rng):
+            list(catalog_courses().using(alias).filter(id__gt=0).order_by('id')[:21])
+            Enrollment.objects.using(alias).filter(student_id=rng.choice(student_ids), course_id=course_id).exists()
+
+        def write(rng):
+            # The shape of flushing lesson views: update, insert if the row is new.
+            student_id, lesson_id = rng.choice(student_ids), rng.choice(lesson_ids)
+            with transaction.atomic(using=alias):
+                progress = LessonProgress.objects.using(alias).filter(student_id=student_id, lesson_id=lesson_id)
+                if not progress.update(viewed=True):
+                    # bulk_create() skips the progress signals, which write to the default database.
+                    LessonProgress.objects.using(alias).bulk_create(
+                        [LessonProgress(student_id=student_id, lesson_id=lesson_id, viewed=True)]
+                    )
+
+        threads = [threading.Thread(target=request, args=[read, reads, i]) for i in range(options['readers'])]
+        threads += [threading.Thread(target=request, args=[write, writes, -i]) for i in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return reads, writes, len(locked)
\ No newline at end of file
@@ -0,0 +1,53 @@
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from lms.gradebook import FORMATS, gradebook_rows
+from lms.models import Course
+from lms.seeding import Volumes, seed
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+class Command(BaseCommand):
+    help = ('Export the gradebook of seeded courses of growing size in every format and report rows/s, '
+            'memory and the queries issued while streaming. The Python heap peak of each export should not grow with the course (data is rolled back).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,50000', help='Comma-separated enrollment counts.')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        with override_settings(DEBUG=False, MEDIA_ROOT=tempfile.mkdtemp()), transaction.atomic():
+            courses = {}
+            for size in sizes:
+                seed(Volumes(instructors=1, students=size, courses=1, enrollments=1), prefix=f'bench_gradebook{size}')
+                courses[size] = Course.objects.get(instructor__username=f'bench_gradebook{size}_instructor_0')
+            self.stdout.write(f"{'students':>9} {'format':>7} {'rows/s':>8} {'MB':>7} {'heap peak KiB':>14} {'queries':>8}")
+            for size in sizes:
+                for name, (stream, _) in sorted(FORMATS.items()):
+                    started = time.perf_counter()
+                    written = sum(len(chunk) for chunk in stream(gradebook_rows(courses[size])))
+                    elapsed = time.perf_counter() - started
+                    # A second, traced run, so tracing does not slow the timed one.
+                    tracemalloc.start()
+                    try:
+                        with CaptureQueriesContext(connection) as queries:
+                            for _ in stream(gradebook_rows(courses[size])):
+                                pass
+                        peak = tracemalloc.get_traced_memory()[1]
+                    finally:
+                        tracemalloc.stop()
+                    self.stdout.write(f'{size:>9} {name:>7} {size / elapsed:>8.0f} {written / 1e6:>7.1f} '
+                                      f'{peak / 1024:>14.0f} {len(queries):>8}')
+            transaction.set_rollback(True)
+        if resource:
+            self.stdout.write(f'Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss} KiB')
\ No newline at end of file
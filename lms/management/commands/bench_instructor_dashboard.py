@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from lms.models import Course, Enrollment, Profile, Lesson, LessonProgress, Quiz, Question, Assignment
+from lms.views import instructor_dashboard
+
+
+class Command(BaseCommand):
+    help = 'Measure instructor_dashboard query count and latency as enrollment grows (data is rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--lessons', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'students':>10} {'queries':>8} {'seconds':>9}")
+        for size in options['sizes']:
+            with transaction.atomic():
+                instructor = self._seed(size, options['lessons'])
+                request = RequestFactory().get('/instructor_dashboard/')
+                request.user = instructor
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    instructor_dashboard(request)
+                    elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+            self.stdout.write(f'{size:>10} {len(queries):>8} {elapsed:>9.3f}')
+
+    def _seed(self, size, lesson_count):
+        instructor = User.objects.create(username='bench_instructor')
+        Profile.objects.create(user=instructor, role='instructor')
+        course = Course.objects.create(title='Bench course', description='', instructor=instructor)
+        lessons = Lesson.objects.bulk_create(
+            Lesson(course=course, title=f'Lesson {i}', video_url='https://youtu.be/bench')
+            for i in range(lesson_count)
+        )
+        quiz = Quiz.objects.create(course=course, title='Bench quiz')
+        Question.objects.create(quiz=quiz, text='?', option1='a', option2='b', option3='c', option4='d', correct_option=1)
+        Assignment.objects.create(course=course, title='Bench assignment', description='')
+        students = User.objects.bulk_create(User(username=f'bench_student_{i}') for i in range(size))
+        Enrollment.objects.bulk_create(Enrollment(student=student, course=course) for student in students)
+        LessonProgress.objects.bulk_create(
+            LessonProgress(student=student, lesson=lesson, viewed=True)
+            for student in students for lesson in lessons[:2]
+        )
+        return instructor
\ No newline at end of file
@@ -0,0 +1,104 @@
+import logging
+import statistics
+import tempfile
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from lms import progress_log
+from lms.models import Course, Enrollment, Profile, Lesson, LessonProgress, Certificate, CourseProgress
+
+
+class Command(BaseCommand):
+    help = ('Compare synchronous and write-behind lesson view recording under concurrent viewers. '
+            'The fixture is committed, because every viewer thread has its own connection, and deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--viewers', type=int, default=200)
+        parser.add_argument('--lessons', type=int, default=20, help='Lessons each viewer opens.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        # Lock errors under contention are counted, not logged one by one.
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        try:
+            course, lessons, students = self._seed(options['viewers'], options['lessons'])
+            try:
+                self.stdout.write(f"{'mode':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'rows':>7}")
+                for mode, buffered in (('direct', False), ('buffered', True)):
+                    with override_settings(DEBUG=False, LMS_PROGRESS_BUFFER=buffered, LMS_PROGRESS_LOG_DIR=tempfile.mkdtemp(),
+                                           LMS_PROGRESS_FLUSH_INTERVAL=0.5):
+                        progress_log._recorder = None
+                        elapsed, latencies, errors = self._run(course, lessons, students)
+                        if buffered:
+                            progress_log.get_recorder().flush()
+                        rows = LessonProgress.objects.filter(lesson__course=course, viewed=True).count()
+                    latencies.sort()
+                    self.stdout.write(
+                        f'{mode:<10} {len(latencies) / elapsed:>8.0f} {statistics.median(latencies) * 1000:>8.1f} '
+                        f'{latencies[int(len(latencies) * 0.95)] * 1000:>8.1f} '
+                        f'{latencies[int(len(latencies) * 0.99)] * 1000:>8.1f} {errors:>7} {rows:>7}'
+                    )
+                    LessonProgress.objects.filter(lesson__course=course).delete()
+                    CourseProgress.objects.filter(course=course).update(lessons_viewed=0)
+            finally:
+                progress_log._recorder = None
+                User.objects.filter(username__startswith='bench_viewer').delete()
+                course.instructor.delete()
+        finally:
+            teardown_test_environment()
+
+    def _run(self, course, lessons, students):
+        urls = [reverse('lms:lesson_detail', args=[course.id, lesson.id]) for lesson in lessons]
+        clients = []
+        for student in students:
+            # Request exceptions are signalled to every client in the process,
+            # so failures are read from the status code instead.
+            client = Client(raise_request_exception=False)
+            client.force_login(student)
+            clients.append(client)
+        start = threading.Barrier(len(clients) + 1)
+        latencies, errors = [], []
+
+        def view(client):
+            start.wait()
+            try:
+                for url in urls:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        errors.append(url)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=view, args=[client]) for client in clients]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started, latencies, len(errors)
+
+    def _seed(self, viewers, lesson_count):
+        # Left behind if an earlier run was killed.
+        User.objects.filter(username__startswith='bench_viewer').delete()
+        instructor = User.objects.create(username='bench_viewer_instructor')
+        course = Course.objects.create(title='Bench course', description='', instructor=instructor)
+        lessons = [
+            Lesson.objects.create(course=course, title=f'Lesson {i}', video_url=f'https://youtu.be/bench{i:06d}')
+            for i in range(lesson_count)
+        ]
+        students = User.objects.bulk_create(User(username=f'bench_viewer_{i}') for i in range(viewers))
+        Profile.objects.bulk_create(Profile(user=student, role='student') for student in students)
+        Enrollment.objects.bulk_create(Enrollment(student=student, course=course) for student in students)
+        Certificate.objects.bulk_create(Certificate(student=student, course=course) for student in students)
+        CourseProgress.objects.bulk_create(CourseProgress(student=student, course=course) for student in students)
+        return course, lessons, students
\ No newline at end of file
@@ -0,0 +1,131 @@
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from lms.management.commands.bench_routes import route_plan
+from lms.models import Certificate, Lesson, Quiz, Assignment
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def seeded_fixture(prefix):
+    """Pick the users and objects ``route_plan()`` needs from ``seed_lms`` data."""
+    certificate = (Certificate.objects.filter(student__username__startswith=f'{prefix}_student_')
+                   .select_related('student', 'course__instructor').order_by('-is_completed', 'id').first())
+    if certificate is None:
+        raise CommandError(f'No enrolled {prefix}_student_* users; run "manage.py seed_lms --prefix {prefix}" first.')
+    course = certificate.course
+    fixture = {
+        'instructor': course.instructor, 'student': certificate.student, 'course': course, 'certificate': certificate,
+        'lesson': Lesson.objects.filter(course=course).order_by('id').first(),
+        'quiz': Quiz.objects.filter(course=course).order_by('id').first(),
+        'assignment': Assignment.objects.filter(course=course).order_by('id').first(),
+    }
+    missing = [name for name, value in fixture.items() if value is None]
+    if missing:
+        raise CommandError(f"The seeded courses have no {', '.join(missing)}; seed with non-zero volumes.")
+    return fixture
+
+
+class Command(BaseCommand):
+    help = ('Drive every route in lms/urls.py through the test client against "manage.py seed_lms" data and report '
+            'latency percentiles, queries per request and peak memory. Save the results with --json and compare '
+            'a later run with --baseline to catch regressions between releases.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='seed', help='The --prefix the data was seeded with.')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per route.')
+        parser.add_argument('--json', help='Write the results to this file.')
+        parser.add_argument('--baseline', help='Results of an earlier run to compare against.')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='How much slower (as a fraction) a route may get before it counts as a regression.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with override_settings(DEBUG=False, MEDIA_ROOT=tempfile.mkdtemp()):
+                results = self._run(seeded_fixture(options['prefix']), options['requests'])
+        finally:
+            teardown_test_environment()
+        report = {
+            'requests': options['requests'],
+            'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+            'routes': results,
+        }
+        self.stdout.write(f"Peak RSS: {report['max_rss_kib']} KiB")
+        if options['json']:
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                regressions = self._compare(json.load(f)['routes'], results, options['tolerance'])
+            if regressions:
+                raise CommandError('Regressions: ' + ', '.join(regressions))
+
+    def _run(self, fixture, count):
+        results = {}
+        self.stdout.write(f"{'route':<26} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KiB':>9}")
+        for name, user, args in route_plan(fixture):
+            url = reverse(name, args=args)
+            client = Client(raise_request_exception=False)
+
+            def get():
+                response = client.get(url)
+                if name == 'lms:user_logout':
+                    client.force_login(user)
+                return response
+
+            if user is not None:
+                client.force_login(user)
+            get()
+            latencies = []
+            for _ in range(count):
+                started = time.perf_counter()
+                get()
+                latencies.append(time.perf_counter() - started)
+            # One more request, instrumented, so the timings above are not.
+            tracemalloc.start()
+            try:
+                with CaptureQueriesContext(connection) as queries:
+                    status = get().status_code
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            latencies.sort()
+            results[name] = {
+                'status': status,
+                'p50_ms': round(statistics.median(latencies) * 1000, 2),
+                'p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+                'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+                'queries': len(queries),
+                'peak_kib': round(peak / 1024),
+            }
+            row = results[name]
+            self.stdout.write(f"{name:<26} {status:>6} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} "
+                              f"{row['queries']:>8} {row['peak_kib']:>9}")
+        return results
+
+    def _compare(self, baseline, results, tolerance):
+        regressions = []
+        for name, row in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            if row['p50_ms'] > before['p50_ms'] * (1 + tolerance):
+                regressions.append(f"{name} p50 {before['p50_ms']} -> {row['p50_ms']} ms")
+            if row['queries'] > before['queries']:
+                regressions.append(f"{name} queries {before['queries']} -> {row['queries']}")
+            if row['peak_kib'] > before['peak_kib'] * (1 + tolerance):
+                regressions.append(f"{name} peak {before['peak_kib']} -> {row['peak_kib']} KiB")
+        return regressions
\ No newline at end of file
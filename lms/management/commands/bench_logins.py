@@ -0,0 +1,109 @@
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from lms.auth import SESSION_ENGINES
+from lms.seeding import Volumes, seed
+
+CONFIGURATIONS = [
+    ('db sessions, ModelBackend', {
+        'SESSION_ENGINE': SESSION_ENGINES['db'],
+        'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    }),
+    ('cached_db sessions, CachedModelBackend', {
+        'SESSION_ENGINE': SESSION_ENGINES['cached_db'],
+        'AUTHENTICATION_BACKENDS': ['lms.auth.CachedModelBackend'],
+    }),
+    ('signed cookies, CachedModelBackend', {
+        'SESSION_ENGINE': SESSION_ENGINES['signed_cookies'],
+        'AUTHENTICATION_BACKENDS': ['lms.auth.CachedModelBackend'],
+    }),
+]
+# Hashing a password with the default PBKDF2 iterations takes longer than
+# everything else in a login; without --keep-hashers the numbers show the
+# session and query work instead.
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class Command(BaseCommand):
+    help = ('Simulate a login storm: seeded students log in and open their dashboard a few times, and new users '
+            'register, once per session and user-cache configuration. Reports throughput, latency and queries '
+            'per request (data is rolled back).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=300, help='Students logging in per configuration.')
+        parser.add_argument('--pages', type=int, default=5, help='Dashboard views after each login.')
+        parser.add_argument('--registrations', type=int, default=100, help='New users per configuration.')
+        parser.add_argument('--keep-hashers', action='store_true', help='Hash passwords with PASSWORD_HASHERS.')
+
+    def handle(self, *args, **options):
+        hashers = {} if options['keep_hashers'] else {'PASSWORD_HASHERS': FAST_HASHERS}
+        setup_test_environment()
+        try:
+            with override_settings(DEBUG=False, MEDIA_ROOT=tempfile.mkdtemp(), **hashers), transaction.atomic():
+                # One more student per configuration for the instrumented run.
+                students = (options['logins'] + 1) * len(CONFIGURATIONS)
+                seed(Volumes(instructors=2, students=students, courses=20, enrollments=3), prefix='bench_logins',
+                     password='bench')
+                self.stdout.write(f"{'configuration':<40} {'logins/s':>9} {'login p50':>10} {'page p50':>9} "
+                                  f"{'regs/s':>7} {'login q':>8} {'page q':>7} {'reg q':>6}")
+                for number, (name, config) in enumerate(CONFIGURATIONS):
+                    with override_settings(**config):
+                        self._run(name, number, options)
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+    def _storm(self, usernames, options):
+        logins, pages = [], []
+        for username in usernames:
+            client = Client()
+            started = time.perf_counter()
+            response = client.post(reverse('lms:user_login'), {'username': username, 'password': 'bench'})
+            logins.append(time.perf_counter() - started)
+            if response.status_code != 302:
+                raise CommandError(f'Login of {username} failed with status {response.status_code}.')
+            for _ in range(options['pages']):
+                started = time.perf_counter()
+                client.get(reverse('lms:dashboard'))
+                pages.append(time.perf_counter() - started)
+        return logins, pages
+
+    def _register(self, username):
+        return Client().post(reverse('lms:register'), {
+            'username': username, 'email': f'{username}@example.com', 'password': 'bench', 'role': 'student',
+        })
+
+    def _run(self, name, number, options):
+        first = number * (options['logins'] + 1)
+        usernames = [f'bench_logins_student_{i}' for i in range(first, first + options['logins'])]
+        started = time.perf_counter()
+        logins, pages = self._storm(usernames, options)
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for i in range(options['registrations']):
+            self._register(f'bench_logins_new_{number}_{i}')
+        registrations = options['registrations'] / (time.perf_counter() - started)
+
+        client = Client()
+        with CaptureQueriesContext(connection) as login_queries:
+            client.post(reverse('lms:user_login'), {'username': f'bench_logins_student_{first + options["logins"]}',
+                                                    'password': 'bench'})
+        client.get(reverse('lms:dashboard'))
+        with CaptureQueriesContext(connection) as page_queries:
+            client.get(reverse('lms:dashboard'))
+        with CaptureQueriesContext(connection) as register_queries:
+            self._register(f'bench_logins_new_{number}_last')
+
+        self.stdout.write(
+            f'{name:<40} {len(logins) / elapsed:>9.0f} {statistics.median(logins) * 1000:>10.2f} '
+            f'{statistics.median(pages) * 1000 if pages else 0:>9.2f} {registrations:>7.0f} '
+            f'{len(login_queries):>8} {len(page_queries):>7} {len(register_queries):>6}'
+        )
\ No newline at end of file
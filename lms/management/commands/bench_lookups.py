@@ -0,0 +1,98 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from lms.models import Course, Enrollment, Lesson, LessonProgress, Assignment, Submission, Certificate
+
+
+class Command(BaseCommand):
+    help = 'Time the (student, course/lesson/assignment) lookups with and without their composite indexes (data is rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Rows per table.')
+        parser.add_argument('--width', type=int, default=100, help='Courses, lessons and assignments per student.')
+        parser.add_argument('--lookups', type=int, default=5000)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            fixture = self._seed(options['rows'], options['width'], options['batch_size'])
+            self.stdout.write(f"Seeded {options['rows']} rows per table in {time.perf_counter() - started:.1f}s")
+
+            rng = random.Random(0)
+            pairs = [(rng.choice(fixture['students']), rng.randrange(options['width'])) for _ in range(options['lookups'])]
+            lookups = [
+                (Enrollment, ('student', 'course'), fixture['courses']),
+                (Certificate, ('student', 'course'), fixture['courses']),
+                (LessonProgress, ('student', 'lesson'), fixture['lessons']),
+                (Submission, ('student', 'assignment'), fixture['assignments']),
+            ]
+
+            self.stdout.write(f"{'table':<16} {'composite ms':>13} {'fk-only ms':>11} {'speedup':>8}")
+            with connection.cursor() as cursor:
+                for model, (student, other), ids in lookups:
+                    columns = [model._meta.get_field(student).column, model._meta.get_field(other).column]
+                    table = model._meta.db_table
+                    baseline = self._baseline_table(cursor, table, columns)
+                    indexed = self._time(cursor, table, columns, pairs, ids)
+                    unindexed = self._time(cursor, baseline, columns, pairs, ids)
+                    self.stdout.write(
+                        f'{model.__name__:<16} {indexed * 1000:>13.3f} {unindexed * 1000:>11.3f} {unindexed / indexed:>7.1f}x'
+                    )
+            transaction.set_rollback(True)
+
+    def _baseline_table(self, cursor, table, columns):
+        # A copy of the rows with only the single-column foreign key indexes
+        # the table had before the composite unique constraints.
+        baseline = f'bench_{table}'
+        cursor.execute(f'CREATE TABLE {baseline} AS SELECT id, {", ".join(columns)} FROM {table}')
+        for column in columns:
+            cursor.execute(f'CREATE INDEX {baseline}_{column} ON {baseline} ({column})')
+        return baseline
+
+    def _time(self, cursor, table, columns, pairs, ids):
+        sql = f'SELECT id FROM {table} WHERE {columns[0]} = %s AND {columns[1]} = %s LIMIT 1'
+        started = time.perf_counter()
+        for student_id, i in pairs:
+            cursor.execute(sql, [student_id, ids[i]])
+            cursor.fetchone()
+        return (time.perf_counter() - started) / len(pairs)
+
+    def _seed(self, rows, width, batch_size):
+        instructor = User.objects.create(username='bench_instructor')
+        courses = Course.objects.bulk_create(
+            Course(title=f'Course {i}', description='', instructor=instructor) for i in range(width)
+        )
+        lessons = Lesson.objects.bulk_create(
+            Lesson(course=courses[0], title=f'Lesson {i}', video_url='https://youtu.be/bench') for i in range(width)
+        )
+        assignments = Assignment.objects.bulk_create(
+            Assignment(course=courses[0], title=f'Assignment {i}', description='') for i in range(width)
+        )
+        students = [
+            user.id for user in
+            User.objects.bulk_create((User(username=f'bench_student_{i}') for i in range(-(-rows // width))), batch_size)
+        ]
+        cells = [(student_id, i) for student_id in students for i in range(width)][:rows]
+        Enrollment.objects.bulk_create(
+            (Enrollment(student_id=s, course_id=courses[i].id) for s, i in cells), batch_size
+        )
+        Certificate.objects.bulk_create(
+            (Certificate(student_id=s, course_id=courses[i].id) for s, i in cells), batch_size
+        )
+        LessonProgress.objects.bulk_create(
+            (LessonProgress(student_id=s, lesson_id=lessons[i].id, viewed=True) for s, i in cells), batch_size
+        )
+        Submission.objects.bulk_create(
+            (Submission(student_id=s, assignment_id=assignments[i].id, file='bench') for s, i in cells), batch_size
+        )
+        return {
+            'students': students,
+            'courses': [course.id for course in courses],
+            'lessons': [lesson.id for lesson in lessons],
+            'assignments': [assignment.id for assignment in assignments],
+        }
\ No newline at end of file
@@ -0,0 +1,101 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+from django.urls import resolve, reverse
+
+from lms.models import Course, Enrollment, Profile, Lesson, Quiz, Question, Assignment, Certificate, CourseProgress
+
+
+def seed_fixture():
+    """Create one instructor, one enrolled student and a small course."""
+    instructor = User.objects.create_user('bench_instructor', 'bench_instructor@example.com', 'bench')
+    Profile.objects.create(user=instructor, role='instructor')
+    student = User.objects.create_user('bench_student', 'bench_student@example.com', 'bench')
+    Profile.objects.create(user=student, role='student')
+    course = Course.objects.create(title='Bench course', description='Benchmark fixture.', instructor=instructor)
+    lesson = Lesson.objects.create(course=course, title='Bench lesson', video_url='https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+    quiz = Quiz.objects.create(course=course, title='Bench quiz')
+    Question.objects.create(quiz=quiz, text='?', option1='a', option2='b', option3='c', option4='d', correct_option=1)
+    assignment = Assignment.objects.create(course=course, title='Bench assignment', description='')
+    Enrollment.objects.create(student=student, course=course)
+    CourseProgress.objects.get_or_create(student=student, course=course)
+    certificate = Certificate.objects.create(student=student, course=course, is_completed=True)
+    return {
+        'instructor': instructor, 'student': student, 'course': course, 'lesson': lesson,
+        'quiz': quiz, 'assignment': assignment, 'certificate': certificate,
+    }
+
+
+def route_plan(fixture):
+    """``(url name, user, url args)`` for a GET of every route in lms/urls.py."""
+    course, instructor, student = fixture['course'].id, fixture['instructor'], fixture['student']
+    return [
+        ('lms:home', None, []),
+        ('lms:user_login', None, []),
+        ('lms:register', None, []),
+        ('lms:dashboard', student, []),
+        ('lms:instructor_dashboard', instructor, []),
+        ('lms:course_list', student, []),
+        ('lms:course_create', instructor, []),
+        ('lms:search', student, []),
+        ('lms:enroll', student, [course]),
+        ('lms:lesson_create', instructor, [course]),
+        ('lms:lesson_detail', student, [course, fixture['lesson'].id]),
+        ('lms:quiz_create', instructor, [course]),
+        ('lms:quiz_take', student, [course, fixture['quiz'].id]),
+        ('lms:assignment_create', instructor, [course]),
+        ('lms:assignment_submit', student, [course, fixture['assignment'].id]),
+        ('lms:roster_upload', instructor, [course]),
+        ('lms:gradebook_export', instructor, [course]),
+        ('lms:certificate_view', student, [fixture['certificate'].id]),
+        ('lms:api_progress', student, []),
+        ('lms:api_course_progress', student, [course]),
+        ('lms:user_logout', student, []),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Report the queries issued by every route in lms/urls.py (data is rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if a route has no @query_budget or goes over it.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with override_settings(MEDIA_ROOT=tempfile.mkdtemp()), transaction.atomic():
+                violations = self._run(seed_fixture())
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+        if options['check'] and violations:
+            raise CommandError('Query budget violations: ' + ', '.join(violations))
+
+    def _run(self, fixture):
+        violations = []
+        self.stdout.write(f"{'route':<26} {'cold':>5} {'warm':>5} {'profile':>8} {'budget':>7}")
+        for name, user, args in route_plan(fixture):
+            url = reverse(name, args=args)
+            budget = getattr(resolve(url).func, 'query_budget', None)
+            cache.clear()
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+            counts = []
+            for _ in range(2):
+                with CaptureQueriesContext(connection) as queries:
+                    client.get(url)
+                counts.append(queries)
+                if name == 'lms:user_logout':
+                    client.force_login(user)
+            profile_queries = sum('"lms_profile"' in query['sql'] for query in counts[1].captured_queries)
+            self.stdout.write(f'{name:<26} {len(counts[0]):>5} {len(counts[1]):>5} {profile_queries:>8} {budget!s:>7}')
+            if budget is None or len(counts[0]) > budget:
+                violations.append(f'{name} ({len(counts[0])}/{budget})')
+        return violations
\ No newline at end of file
@@ -0,0 +1,81 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from lms.models import Course, Lesson, Assignment
+from lms.search import fts_enabled, match_expression, query_index, rebuild_index, search_icontains, PAGE_SIZE, TABLE
+
+# A common word, an uncommon one, a rare one and a two-word query.
+QUERIES = ['data', 'kinetics', 'zygote', 'graph theory']
+VOCABULARY = 5000
+
+
+class Command(BaseCommand):
+    help = 'Compare FTS5 search with an icontains scan on a synthetic corpus (data is rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000, help='Courses, lessons and assignments in total.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            raise CommandError('The search index needs SQLite with FTS5.')
+        with transaction.atomic():
+            started = time.perf_counter()
+            self._seed(options['rows'], options['batch_size'])
+            self.stdout.write(f"Seeded {options['rows']} rows in {time.perf_counter() - started:.1f}s")
+            started = time.perf_counter()
+            rebuild_index(options['batch_size'])
+            self.stdout.write(f'Built the index in {time.perf_counter() - started:.1f}s')
+
+            # icontains can stop at the first page of unranked matches; FTS
+            # ranks every match, so its cost follows the match count.
+            self.stdout.write(f"{'query':<14} {'matches':>8} {'fts ms':>9} {'icontains ms':>13} {'speedup':>8}")
+            for query in QUERIES:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'SELECT count(*) FROM {TABLE} WHERE {TABLE} MATCH %s', [match_expression(query)])
+                    matches = cursor.fetchone()[0]
+                fts = self._time(lambda: query_index(query), options['repeat'])
+                scan = self._time(lambda: search_icontains(query, 0, PAGE_SIZE + 1), options['repeat'])
+                self.stdout.write(f'{query:<14} {matches:>8} {fts * 1000:>9.2f} {scan * 1000:>13.2f} {scan / fts:>7.1f}x')
+            transaction.set_rollback(True)
+
+    def _time(self, search, repeat):
+        search()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            search()
+        return (time.perf_counter() - started) / repeat
+
+    def _seed(self, rows, batch_size):
+        rng = random.Random(0)
+        words = [f'w{i}' for i in range(VOCABULARY)]
+        rare = ['data', 'kinetics', 'zygote', 'graph', 'theory']
+        weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+
+        def text(length):
+            chosen = rng.choices(words, weights, k=length)
+            # Sprinkle the query words in with falling frequency.
+            for position, word in enumerate(rare):
+                if rng.random() < 0.05 / (position + 1):
+                    chosen[rng.randrange(length)] = word
+            return ' '.join(chosen)
+
+        instructor = User.objects.create(username='bench_search_instructor')
+        course_rows, lesson_rows = rows // 5, rows * 3 // 5
+        courses = Course.objects.bulk_create(
+            (Course(title=text(4), description=text(60), instructor=instructor) for _ in range(course_rows)), batch_size
+        )
+        Lesson.objects.bulk_create(
+            (Lesson(course=rng.choice(courses), title=text(5), video_url='https://youtu.be/bench') for _ in range(lesson_rows)),
+            batch_size,
+        )
+        Assignment.objects.bulk_create(
+            (Assignment(course=rng.choice(courses), title=text(4), description=text(30))
+             for _ in range(rows - course_rows - lesson_rows)),
+            batch_size,
+        )
\ No newline at end of file
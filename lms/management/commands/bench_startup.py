@@ -0,0 +1,82 @@
+import json
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from .audit_imports import subprocess_env
+
+# Run in a fresh interpreter per worker: boot the WSGI application the way a
+# server does, serve the paths in order, report timings and memory as JSON.
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+for module in {preload!r}:
+    __import__(module)
+from django.conf import settings
+settings.LMS_WARM_UP = {warm!r}
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+booted = time.perf_counter()
+requests = []
+for path in {paths!r}:
+    environ = {{'PATH_INFO': path, 'HTTP_HOST': {host!r}, 'wsgi.input': BytesIO()}}
+    setup_testing_defaults(environ)
+    statuses = []
+    request_started = time.perf_counter()
+    response = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b''.join(response)
+    response.close()
+    requests.append((path, statuses[0], time.perf_counter() - request_started))
+try:
+    import resource
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    peak_rss = None
+print(json.dumps({{'boot': booted - started, 'requests': requests, 'peak_rss': peak_rss,
+                   'modules': len(sys.modules), 'reportlab': 'reportlab' in sys.modules}}))
+'''
+
+
+class Command(BaseCommand):
+    help = ('Start fresh interpreters that boot the WSGI application and serve a few pages, with and without '
+            'LMS_WARM_UP, and report boot time, time to first response, the later requests and peak RSS per worker.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Workers started per mode; medians are reported.')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request, in order (default: the home and login pages). Repeatable.')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS.')
+        parser.add_argument('--preload', action='append', default=[],
+                            help='Module to import before Django, e.g. reportlab.platypus to measure an eager '
+                                 'import. Repeatable.')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or [reverse('lms:home'), reverse('lms:user_login'), reverse('lms:home')]
+        self.stdout.write(f"{'mode':<6} {'boot ms':>8} {'first ms':>9} {'ttfr ms':>8} {'later ms':>9} "
+                          f"{'RSS MiB':>8} {'modules':>8} {'reportlab':>10}")
+        for warm in (False, True):
+            probe = PROBE.format(preload=options['preload'], warm=warm, paths=paths, host=options['host'])
+            runs = [self._start(probe) for _ in range(options['runs'])]
+            boot = statistics.median(run['boot'] for run in runs)
+            first = statistics.median(run['requests'][0][2] for run in runs)
+            later = statistics.median(elapsed for run in runs for _, _, elapsed in run['requests'][1:]) \
+                if len(paths) > 1 else 0
+            rss = statistics.median(run['peak_rss'] or 0 for run in runs) / 1024
+            failed = {f'{path} {status}' for run in runs for path, status, _ in run['requests']
+                      if not status.startswith(('2', '3'))}
+            if failed:
+                raise CommandError('Requests failed: ' + ', '.join(sorted(failed)))
+            self.stdout.write(f"{'warm' if warm else 'cold':<6} {boot * 1000:>8.1f} {first * 1000:>9.1f} "
+                              f"{(boot + first) * 1000:>8.1f} {later * 1000:>9.1f} {rss:>8.1f} "
+                              f"{runs[0]['modules']:>8} {'loaded' if runs[0]['reportlab'] else 'no':>10}")
+
+    def _start(self, probe):
+        result = subprocess.run([sys.executable, '-c', probe], env=subprocess_env(), capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        return json.loads(result.stdout.strip().splitlines()[-1])
\ No newline at end of file
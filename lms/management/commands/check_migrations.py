@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+
+from lms.models import Certificate, Enrollment, LessonProgress, Submission
+
+# The last migration before duplicates are merged (0006_unique_constraints).
+BEFORE_MERGE = ('lms', '0005_submission_blob_metadata')
+ALIAS = 'check_migrations'
+
+
+class Command(BaseCommand):
+    help = ('Migrate a scratch SQLite database to 0005, add duplicate enrollments, certificates, lesson progress '
+            'rows and submissions, migrate it to the latest migration and check that each set was merged into '
+            'the right row. The database is deleted afterwards.')
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp()
+        connections.settings[ALIAS] = {
+            **connections.settings['default'], 'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(directory, 'check_migrations.sqlite3'), 'OPTIONS': {},
+        }
+        try:
+            call_command('migrate', *BEFORE_MERGE, database=ALIAS, verbosity=0)
+            latest_submission = self._add_duplicates(MigrationLoader(connections[ALIAS]).project_state(BEFORE_MERGE).apps)
+            call_command('migrate', 'lms', database=ALIAS, verbosity=0)
+            problems = self._problems(latest_submission)
+        finally:
+            connections[ALIAS].close()
+            del connections.settings[ALIAS]
+            shutil.rmtree(directory)
+        if problems:
+            raise CommandError('Duplicates were not merged as expected:\n' + '\n'.join(problems))
+        self.stdout.write('Migrated duplicate rows from 0005 to the latest migration: OK')
+
+    def _add_duplicates(self, apps):
+        """Three rows per unique key in the 0005 schema; only the middle one is completed/viewed."""
+        User = apps.get_model('auth', 'User')
+        instructor = User.objects.using(ALIAS).create(username='check_instructor')
+        student = User.objects.using(ALIAS).create(username='check_student')
+        course = apps.get_model('lms', 'Course').objects.using(ALIAS).create(
+            title='Course', description='', instructor=instructor,
+        )
+        lesson = apps.get_model('lms', 'Lesson').objects.using(ALIAS).create(
+            title='Lesson', video_url='https://example.com/', course=course,
+        )
+        assignment = apps.get_model('lms', 'Assignment').objects.using(ALIAS).create(
+            title='Assignment', description='', course=course,
+        )
+        for done in (False, True, False):
+            apps.get_model('lms', 'Enrollment').objects.using(ALIAS).create(student=student, course=course)
+            apps.get_model('lms', 'Certificate').objects.using(ALIAS).create(
+                student=student, course=course, is_completed=done,
+            )
+            apps.get_model('lms', 'LessonProgress').objects.using(ALIAS).create(
+                student=student, lesson=lesson, viewed=done,
+            )
+            submission = apps.get_model('lms', 'Submission').objects.using(ALIAS).create(
+                student=student, assignment=assignment, file='',
+            )
+        return submission.pk
+
+    def _problems(self, latest_submission):
+        problems = []
+        for model in (Enrollment, Certificate, LessonProgress, Submission):
+            count = model.objects.using(ALIAS).count()
+            if count != 1:
+                problems.append(f'{model.__name__}: {count} rows left, expected 1')
+        if not Certificate.objects.using(ALIAS).filter(is_completed=True).exists():
+            problems.append('Certificate: the completed duplicate was lost')
+        if not LessonProgress.objects.using(ALIAS).filter(viewed=True).exists():
+            problems.append('LessonProgress: the viewed duplicate was lost')
+        if not Submission.objects.using(ALIAS).filter(pk=latest_submission).exists():
+            problems.append('Submission: the latest upload was not kept')
+        return problems
\ No newline at end of file
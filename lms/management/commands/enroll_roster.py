@@ -0,0 +1,49 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.models import Course
+from lms.roster import enroll_roster, read_roster
+
+
+class Command(BaseCommand):
+    help = 'Enroll every student listed in a CSV roster (a "username" or "email" column) in a course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int)
+        parser.add_argument('path', help="Roster to read, or '-' for stdin.")
+        parser.add_argument('--batch-size', type=int, default=1000, help='Roster rows enrolled per transaction.')
+
+    def handle(self, *args, **options):
+        course = Course.objects.filter(pk=options['course_id']).first()
+        if course is None:
+            raise CommandError(f"Course {options['course_id']} does not exist.")
+        path = options['path']
+        started = time.perf_counter()
+
+        def progress(totals):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{totals['rows']} rows, {totals['enrolled']} enrolled ({totals['rows'] / elapsed:.0f} rows/s)"
+            )
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        try:
+            totals, unmatched = enroll_roster(
+                course, read_roster(stream), batch_size=options['batch_size'],
+                progress=progress if options['verbosity'] > 1 else None,
+            )
+        except ValueError as exc:
+            raise CommandError(f'Enrollment stopped: {exc}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Enrolled {totals['enrolled']} students in {course.title} from {totals['rows']} rows in {elapsed:.2f}s "
+            f"({totals['rows'] / elapsed:.0f} rows/s); {totals['already enrolled']} were already enrolled, "
+            f"{totals['not students']} are not students and {totals['unmatched']} matched no user."
+        )
+        if unmatched:
+            self.stdout.write(f"No user named: {', '.join(unmatched)}")
\ No newline at end of file
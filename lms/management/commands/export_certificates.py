@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.certificates import render_pending, write_course_archive
+from lms.models import Course, Certificate
+
+
+class Command(BaseCommand):
+    help = 'Write all completed certificates of a course to a single ZIP file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int)
+        parser.add_argument('output', help="Path of the ZIP file, or '-' for stdout.")
+        parser.add_argument('--workers', type=int, help='Worker processes used to render missing PDFs.')
+
+    def handle(self, *args, **options):
+        try:
+            course = Course.objects.get(pk=options['course_id'])
+        except Course.DoesNotExist:
+            raise CommandError(f"Course {options['course_id']} does not exist.")
+        render_pending(Certificate.objects.filter(course=course), workers=options['workers'])
+        if options['output'] == '-':
+            write_course_archive(course, sys.stdout.buffer)
+            return
+        with open(options['output'], 'wb') as output:
+            count = write_course_archive(course, output)
+        self.stdout.write(f"Wrote {count} certificates to {options['output']}.")
\ No newline at end of file
@@ -0,0 +1,30 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from lms.course_io import WRITERS, export_records
+from lms.models import Course
+
+
+class Command(BaseCommand):
+    help = 'Export courses with their lessons, quizzes, questions and assignments as JSON Lines or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to write, or '-' for stdout.")
+        parser.add_argument('--format', choices=sorted(WRITERS), help='Defaults to the file extension.')
+        parser.add_argument('--course', type=int, action='append', help='Only export this course id (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=200, help='Courses loaded per query batch.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        courses = Course.objects.all()
+        if options['course']:
+            courses = courses.filter(id__in=options['course'])
+        records = export_records(courses, batch_size=options['batch_size'])
+        if path == '-':
+            WRITERS[file_format](sys.stdout, records)
+            return
+        with open(path, 'w', newline='', encoding='utf-8') as stream:
+            WRITERS[file_format](stream, records)
+        self.stderr.write(f'Exported {courses.count()} courses to {path}.')
\ No newline at end of file
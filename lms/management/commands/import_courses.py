@@ -0,0 +1,48 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.course_io import READERS, import_records
+
+
+class Command(BaseCommand):
+    help = 'Import courses with their lessons, quizzes, questions and assignments from JSON Lines or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to read, or '-' for stdin.")
+        parser.add_argument('--format', choices=sorted(READERS), help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=200, help='Courses created per transaction.')
+        parser.add_argument('--instructor', help='Username used for records without an instructor.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        started = time.perf_counter()
+
+        def progress(totals):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{totals['courses']} courses, {totals['questions']} questions "
+                f"({totals['questions'] / elapsed:.0f} questions/s)"
+            )
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            totals = import_records(
+                READERS[file_format](stream),
+                batch_size=options['batch_size'],
+                default_instructor=options['instructor'],
+                progress=progress if options['verbosity'] > 1 else None,
+            )
+        except (ValueError, KeyError) as exc:
+            raise CommandError(f'Import stopped: {exc}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Imported {totals.get('courses', 0)} courses, {totals.get('lessons', 0)} lessons, "
+            f"{totals.get('quizzes', 0)} quizzes, {totals.get('questions', 0)} questions and "
+            f"{totals.get('assignments', 0)} assignments in {elapsed:.2f}s."
+        )
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lms.dedupe import merge_duplicates
+
+
+class Command(BaseCommand):
+    help = 'Merge duplicate enrollments, certificates, lesson progress rows and submissions.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            removed = merge_duplicates(apps.get_model)
+        for name, count in removed.items():
+            self.stdout.write(f'{name}: removed {count} duplicate rows')
+        if removed['LessonProgress'] or removed['Submission']:
+            # Deleting duplicates goes through the progress signals, which
+            # count every row; recount from the merged tables.
+            call_command('rebuild_progress', stdout=self.stdout)
\ No newline at end of file
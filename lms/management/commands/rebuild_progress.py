@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from lms.completion import rebuild_progress
+from lms.models import Course
+
+
+class Command(BaseCommand):
+    help = 'Recompute course totals and per-student progress counters from the source tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing the corrected counters.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Number of courses recounted per pass.')
+
+    def handle(self, *args, **options):
+        course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+        courses_fixed = progress_fixed = 0
+        for start in range(0, len(course_ids), options['batch_size']):
+            fixed = rebuild_progress(course_ids[start:start + options['batch_size']], dry_run=options['dry_run'])
+            courses_fixed += fixed[0]
+            progress_fixed += fixed[1]
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(f'{verb} drift in {courses_fixed} course totals and {progress_fixed} progress records '
+                          f'across {len(course_ids)} courses.')
\ No newline at end of file
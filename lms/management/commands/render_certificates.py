@@ -0,0 +1,41 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from lms.certificates import render_pending
+from lms.models import Certificate
+
+# Polls look back this far before the previous one started, for clock skew
+# between servers and for transactions that committed after it.
+WATCH_OVERLAP = datetime.timedelta(minutes=1)
+
+
+class Command(BaseCommand):
+    help = 'Render PDFs for completed certificates that have none yet, using a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, help='Only render certificates of this course id.')
+        parser.add_argument('--workers', type=int, help='Worker processes (defaults to the CPU count).')
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--watch', action='store_true', help='Keep polling for newly completed certificates.')
+        parser.add_argument('--interval', type=float, default=10.0, help='Seconds between polls with --watch.')
+
+    def handle(self, *args, **options):
+        certificates = Certificate.objects.all()
+        if options['course']:
+            certificates = certificates.filter(course_id=options['course'])
+        # The first pass checks every certificate; later ones only what changed.
+        since = None
+        while True:
+            started = time.perf_counter()
+            polled_at = timezone.now()
+            rendered = render_pending(certificates, workers=options['workers'], batch_size=options['batch_size'],
+                                      since=since)
+            since = polled_at - WATCH_OVERLAP
+            if rendered or not options['watch']:
+                self.stdout.write(f'Rendered {rendered} certificates in {time.perf_counter() - started:.2f}s.')
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.progress_log import buffering_enabled, log_dir, replay_logs
+
+
+class Command(BaseCommand):
+    help = 'Write lesson views left in the progress log by processes that exited before flushing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help='Log directory (default: LMS_PROGRESS_LOG_DIR).')
+
+    def handle(self, *args, **options):
+        if not buffering_enabled():
+            raise CommandError('Lesson views are not buffered (LMS_PROGRESS_BUFFER is off or fcntl is unavailable).')
+        directory = options['directory'] or log_dir()
+        self.stdout.write(f'Replayed {replay_logs(directory)} lesson views from {directory}.')
\ No newline at end of file
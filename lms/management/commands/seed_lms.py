@@ -0,0 +1,36 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from lms.seeding import Volumes, seed
+
+
+class Command(BaseCommand):
+    help = ('Bulk-generate users, courses, content and student activity for local load testing. '
+            'The same options and --seed always generate the same data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='seed', help='Prefix of the generated usernames.')
+        parser.add_argument('--password', default='seed', help='Password of every generated user.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Students written per transaction.')
+        for field, default in Volumes._field_defaults.items():
+            parser.add_argument(f'--{field}', type=type(default), default=default)
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(f"Users named {options['prefix']}_* already exist; pick another --prefix or database.")
+        volumes = Volumes(**{field: options[field] for field in Volumes._fields})
+        started = time.perf_counter()
+
+        def progress(students):
+            self.stdout.write(f'{students}/{volumes.students} students', ending='\r')
+            self.stdout.flush()
+
+        counts = seed(volumes, seed=options['seed'], prefix=options['prefix'], password=options['password'],
+                      batch_size=options['batch_size'], progress=progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write('')
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in counts.items()))
+        self.stdout.write(f'{sum(counts.values())} objects in {elapsed:.1f}s ({sum(counts.values()) / elapsed:.0f}/s).')
\ No newline at end of file
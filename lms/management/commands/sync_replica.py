@@ -0,0 +1,45 @@
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from lms.db import REPLICA
+
+
+class Command(BaseCommand):
+    help = ('Copy the primary SQLite database over the replica file that stands in for a streaming replica. '
+            'The copy is written next to the replica and renamed over it, so readers never see a partial file.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep copying every INTERVAL seconds instead of once.')
+
+    def handle(self, *args, **options):
+        if REPLICA not in settings.DATABASES:
+            raise CommandError('No replica database is configured; set LMS_DB_REPLICA.')
+        primary = connections['default']
+        if primary.vendor != 'sqlite' or connections[REPLICA].vendor != 'sqlite':
+            raise CommandError('Only SQLite replicas are copied; a PostgreSQL replica follows its primary by itself.')
+        while True:
+            started = time.perf_counter()
+            self._copy(primary, connections[REPLICA].settings_dict['NAME'])
+            connections[REPLICA].close()
+            self.stdout.write(f'Copied the primary database to the replica in {time.perf_counter() - started:.2f}s.')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _copy(self, primary, path):
+        primary.ensure_connection()
+        partial = f'{path}.partial'
+        target = sqlite3.connect(partial)
+        try:
+            primary.connection.backup(target)
+            # The copy is replaced whole next time; see lms.db.configure_connection().
+            target.execute('PRAGMA journal_mode = delete')
+        finally:
+            target.close()
+        os.replace(partial, path)
\ No newline at end of file
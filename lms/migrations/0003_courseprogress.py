@@ -0,0 +1,91 @@
+# Generated by Django 4.2 on 2026-10-18 02:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_progress(apps, schema_editor):
+    Course = apps.get_model('lms', 'Course')
+    CourseProgress = apps.get_model('lms', 'CourseProgress')
+    Enrollment = apps.get_model('lms', 'Enrollment')
+    LessonProgress = apps.get_model('lms', 'LessonProgress')
+    Submission = apps.get_model('lms', 'Submission')
+    QuizAttempt = apps.get_model('lms', 'QuizAttempt')
+    db = schema_editor.connection.alias
+
+    for course in Course.objects.using(db).annotate(
+        lessons=models.Count('lesson', distinct=True),
+        assignments=models.Count('assignment', distinct=True),
+        quizzes=models.Count('quiz', distinct=True),
+    ):
+        course.lesson_count = course.lessons
+        course.assignment_count = course.assignments
+        course.quiz_count = course.quizzes
+        course.save(using=db, update_fields=['lesson_count', 'assignment_count', 'quiz_count'])
+
+    def counts(queryset, course_field, counted_field):
+        rows = queryset.values(course_field, 'student_id').annotate(total=models.Count(counted_field, distinct=True))
+        return {(row[course_field], row['student_id']): row['total'] for row in rows}
+
+    viewed = counts(LessonProgress.objects.using(db).filter(viewed=True), 'lesson__course_id', 'lesson_id')
+    submitted = counts(Submission.objects.using(db), 'assignment__course_id', 'assignment_id')
+    passed = counts(QuizAttempt.objects.using(db).filter(passed=True), 'quiz__course_id', 'quiz_id')
+    enrolled = set(Enrollment.objects.using(db).values_list('course_id', 'student_id'))
+    keys = enrolled | set(viewed) | set(submitted) | set(passed)
+    CourseProgress.objects.using(db).bulk_create(
+        (
+            CourseProgress(
+                course_id=course_id,
+                student_id=student_id,
+                lessons_viewed=viewed.get((course_id, student_id), 0),
+                assignments_submitted=submitted.get((course_id, student_id), 0),
+                quizzes_passed=passed.get((course_id, student_id), 0),
+            )
+            for course_id, student_id in keys
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('lms', '0002_quizattempt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='assignment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='quiz_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CourseProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lessons_viewed', models.PositiveIntegerField(default=0)),
+                ('assignments_submitted', models.PositiveIntegerField(default=0)),
+                ('quizzes_passed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='lms.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='courseprogress',
+            constraint=models.UniqueConstraint(fields=('student', 'course'), name='unique_course_progress'),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0003_courseprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='rendered_digest',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
\ No newline at end of file
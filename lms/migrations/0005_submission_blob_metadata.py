@@ -0,0 +1,51 @@
+# Generated by Django 4.2 on 2026-10-18 02:11
+
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def backfill_file_metadata(apps, schema_editor):
+    Submission = apps.get_model('lms', 'Submission')
+    db = schema_editor.connection.alias
+    for submission in Submission.objects.using(db).exclude(file='').iterator():
+        if not default_storage.exists(submission.file.name):
+            continue
+        hasher = hashlib.sha256()
+        size = 0
+        with default_storage.open(submission.file.name) as source:
+            for chunk in source.chunks():
+                hasher.update(chunk)
+                size += len(chunk)
+        submission.original_name = os.path.basename(submission.file.name)
+        submission.size = size
+        submission.sha256 = hasher.hexdigest()
+        submission.save(using=db, update_fields=['original_name', 'size', 'sha256'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0004_certificate_rendered_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='size',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_file_metadata, migrations.RunPython.noop),
+    ]
\ No newline at end of file
@@ -0,0 +1,83 @@
+# Generated by Django 4.2 on 2026-10-18 02:16
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# A frozen copy of lms.dedupe as of this migration: the historical models
+# here have no Certificate.updated_at, which the live merge also saves.
+UNIQUE_KEYS = {
+    'Enrollment': ('student', 'course'),
+    'Certificate': ('student', 'course'),
+    'LessonProgress': ('student', 'lesson'),
+    'Submission': ('assignment', 'student'),
+}
+
+
+def _merge_certificates(rows):
+    keep = rows[0]
+    if any(row.is_completed for row in rows) and not keep.is_completed:
+        keep.is_completed = True
+        keep.save(using=keep._state.db, update_fields=['is_completed'])
+    return keep
+
+
+def _merge_lesson_progress(rows):
+    keep = rows[0]
+    if any(row.viewed for row in rows) and not keep.viewed:
+        keep.viewed = True
+        keep.save(using=keep._state.db, update_fields=['viewed'])
+    return keep
+
+
+def _merge_submissions(rows):
+    # The most recent upload is the one that counts.
+    return max(rows, key=lambda row: (row.submitted_at, row.id))
+
+
+MERGERS = {
+    'Enrollment': lambda rows: rows[0],
+    'Certificate': _merge_certificates,
+    'LessonProgress': _merge_lesson_progress,
+    'Submission': _merge_submissions,
+}
+
+
+def merge_duplicate_rows(apps, schema_editor):
+    # The constraints below cannot be created while duplicates exist.
+    db = schema_editor.connection.alias
+    for name, fields in UNIQUE_KEYS.items():
+        model = apps.get_model('lms', name)
+        key = [f'{field}_id' for field in fields]
+        groups = model.objects.using(db).values(*key).annotate(rows=Count('id')).filter(rows__gt=1).values_list(*key)
+        for values in list(groups):
+            rows = list(model.objects.using(db).filter(**dict(zip(key, values))).order_by('id'))
+            keep = MERGERS[name](rows)
+            model.objects.using(db).filter(pk__in=[row.pk for row in rows if row.pk != keep.pk]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0005_submission_blob_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='certificate',
+            constraint=models.UniqueConstraint(fields=('student', 'course'), name='unique_certificate'),
+        ),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('student', 'course'), name='unique_enrollment'),
+        ),
+        migrations.AddConstraint(
+            model_name='lessonprogress',
+            constraint=models.UniqueConstraint(fields=('student', 'lesson'), name='unique_lesson_progress'),
+        ),
+        migrations.AddConstraint(
+            model_name='submission',
+            constraint=models.UniqueConstraint(fields=('assignment', 'student'), name='unique_submission'),
+        ),
+    ]
\ No newline at end of file
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite-only; elsewhere lms.search falls back to icontains.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE lms_search USING fts5("
+        "course_id UNINDEXED, title, body, tokenize = 'porter unicode61')"
+    )
+    # rowid = pk * 4 + kind, see lms.search.
+    schema_editor.execute(
+        "INSERT INTO lms_search (rowid, course_id, title, body) "
+        "SELECT id * 4 + 1, id, title, description FROM lms_course"
+    )
+    schema_editor.execute(
+        "INSERT INTO lms_search (rowid, course_id, title, body) "
+        "SELECT id * 4 + 2, course_id, title, '' FROM lms_lesson"
+    )
+    schema_editor.execute(
+        "INSERT INTO lms_search (rowid, course_id, title, body) "
+        "SELECT id * 4 + 3, course_id, title, description FROM lms_assignment"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE lms_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0006_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
\ No newline at end of file
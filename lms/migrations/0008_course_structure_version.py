@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='structure_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
\ No newline at end of file
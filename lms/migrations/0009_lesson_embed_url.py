@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-18 03:18
+
+from itertools import islice
+
+from django.db import migrations, models
+
+from lms.video import parse_video
+
+
+def normalize_video_urls(apps, schema_editor):
+    Lesson = apps.get_model('lms', 'Lesson')
+    db = schema_editor.connection.alias
+    lessons = Lesson.objects.using(db).only('id', 'video_url').order_by('id').iterator(chunk_size=1000)
+    while batch := list(islice(lessons, 1000)):
+        for lesson in batch:
+            lesson.video_provider, lesson.video_id, lesson.embed_url = parse_video(lesson.video_url) or ('', '', '')
+        Lesson.objects.using(db).bulk_update(batch, ['video_provider', 'video_id', 'embed_url'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0008_course_structure_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='embed_url',
+            field=models.URLField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_id',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_provider',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.RunPython(normalize_video_urls, migrations.RunPython.noop),
+    ]
\ No newline at end of file
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-18 04:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_issued_at(apps, schema_editor):
+    Certificate = apps.get_model('lms', 'Certificate')
+    db = schema_editor.connection.alias
+    Certificate.objects.using(db).update(updated_at=models.F('issued_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0009_lesson_embed_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_issued_at, migrations.RunPython.noop),
+    ]
\ No newline at end of file
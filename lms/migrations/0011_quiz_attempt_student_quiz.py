@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0010_certificate_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['student', 'quiz'], name='quiz_attempt_student_quiz'),
+        ),
+    ]
\ No newline at end of file
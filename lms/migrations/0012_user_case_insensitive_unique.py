@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# auth_user belongs to django.contrib.auth, so its extra indexes are created
+# here. Blank emails (e.g. superusers created without one) may repeat;
+# queries must repeat the email condition for the index to be used.
+INDEXES = [
+    ('lms_user_username_ci', 'username', ''),
+    ('lms_user_email_ci', 'email', " WHERE email > ''"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    db = schema_editor.connection.alias
+    for name, column, condition in INDEXES:
+        # The indexes cannot be created while two accounts differ only in case.
+        duplicates = list(
+            User.objects.using(db).exclude(**{column: ''}).values(value=Lower(column)).annotate(count=Count('id'))
+            .filter(count__gt=1).values_list('value', flat=True)[:10]
+        )
+        if duplicates:
+            raise RuntimeError(
+                f"Cannot make {column} unique regardless of case: {', '.join(duplicates)} belong to more than one "
+                f"account. Rename or merge those accounts and migrate again."
+            )
+        table = schema_editor.quote_name(User._meta.db_table)
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX {name} ON {table} (LOWER({schema_editor.quote_name(column)})){condition}'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for name, _, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('lms', '0011_quiz_attempt_student_quiz'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
\ No newline at end of file
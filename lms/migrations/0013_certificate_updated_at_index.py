@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0012_user_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['updated_at'], name='certificate_updated_at'),
+        ),
+    ]
\ No newline at end of file
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .video import parse_video
+
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     role = models.CharField(max_length=20, choices=[('student', 'Student'), ('instructor', 'Instructor')])
@@ -9,6 +11,11 @@ class Course(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     instructor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='courses')
+    lesson_count = models.PositiveIntegerField(default=0)
+    assignment_count = models.PositiveIntegerField(default=0)
+    quiz_count = models.PositiveIntegerField(default=0)
+    # Bumped whenever a lesson, quiz, assignment or question changes; keys the cached structure.
+    structure_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.title
@@ -18,10 +25,30 @@ class Enrollment(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     enrolled_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'course'], name='unique_enrollment'),
+        ]
+
 class Lesson(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
     video_url = models.URLField()
+    # Derived from video_url on save; empty when the link cannot be embedded.
+    video_provider = models.CharField(max_length=20, blank=True)
+    video_id = models.CharField(max_length=32, blank=True)
+    embed_url = models.URLField(blank=True)
+
+    def normalize_video(self):
+        """Set the derived video fields; call before ``bulk_create()``, which skips ``save()``."""
+        self.video_provider, self.video_id, self.embed_url = parse_video(self.video_url) or ('', '', '')
+
+    def save(self, *args, **kwargs):
+        self.normalize_video()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'video_url' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'video_provider', 'video_id', 'embed_url'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -31,6 +58,11 @@ class LessonProgress(models.Model):
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE)
     viewed = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'lesson'], name='unique_lesson_progress'),
+        ]
+
 class Quiz(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
@@ -50,6 +82,26 @@ class Question(models.Model):
     def __str__(self):
         return self.text
 
+class QuizAttempt(models.Model):
+    student = models.ForeignKey(User, on_delete=models.CASCADE)
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempts')
+    score = models.PositiveIntegerField()
+    total = models.PositiveIntegerField()
+    passed = models.BooleanField(default=False)
+    submitted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Best scores are looked up for a chunk of students at a time (see lms.gradebook).
+        indexes = [
+            models.Index(fields=['student', 'quiz'], name='quiz_attempt_student_quiz'),
+        ]
+
+class AttemptAnswer(models.Model):
+    attempt = models.ForeignKey(QuizAttempt, on_delete=models.CASCADE, related_name='answers')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    selected_option = models.PositiveSmallIntegerField()
+    is_correct = models.BooleanField()
+
 class Assignment(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     title = models.CharField(max_length=200)
@@ -62,10 +114,52 @@ class Submission(models.Model):
     assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE)
     student = models.ForeignKey(User, on_delete=models.CASCADE)
     file = models.FileField(upload_to='submissions/')
+    original_name = models.CharField(max_length=255, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['assignment', 'student'], name='unique_submission'),
+        ]
+
 class Certificate(models.Model):
     student = models.ForeignKey(User, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
     issued_at = models.DateTimeField(auto_now_add=True)
-    is_completed = models.BooleanField(default=False)
\ No newline at end of file
+    is_completed = models.BooleanField(default=False)
+    # Also set by lms.completion.mark_completed(), which updates in bulk.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Digest of the last PDF rendered for this certificate (see lms.certificates).
+    rendered_digest = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'course'], name='unique_certificate'),
+        ]
+        indexes = [
+            # What render_certificates --watch polls; see lms.certificates.pending_certificates().
+            models.Index(fields=['updated_at'], name='certificate_updated_at'),
+        ]
+
+class CourseProgress(models.Model):
+    student = models.ForeignKey(User, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='progress')
+    lessons_viewed = models.PositiveIntegerField(default=0)
+    assignments_submitted = models.PositiveIntegerField(default=0)
+    quizzes_passed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'course'], name='unique_course_progress'),
+        ]
+
+    def is_complete(self, course):
+        # At least one quiz must be passed when the course has any.
+        return (
+            self.lessons_viewed >= course.lesson_count
+            and self.assignments_submitted >= course.assignment_count
+            and (course.quiz_count == 0 or self.quizzes_passed > 0)
+        )
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""Write-behind recording of lesson views.
+
+``record_view()`` appends each view to an append-only log segment owned by
+the current process and buffers it in memory. The buffer is written with
+``record_lesson_views()`` once ``LMS_PROGRESS_FLUSH_SIZE`` views are pending
+or every ``LMS_PROGRESS_FLUSH_INTERVAL`` seconds, and a segment is deleted
+only after its views are committed.
+
+Every segment stays under an exclusive ``flock`` while its process is alive,
+so ``replay_logs()`` can tell the segments of processes that died before
+flushing from live ones. Each recorder replays them on start-up, and so does
+``manage.py replay_progress_log``. Without ``fcntl`` (Windows), or with
+``LMS_PROGRESS_BUFFER = False``, views are written synchronously.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .completion import record_lesson_views
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger('lms.progress')
+
+DEFAULT_FLUSH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+
+def buffering_enabled():
+    return fcntl is not None and getattr(settings, 'LMS_PROGRESS_BUFFER', True)
+
+
+def log_dir():
+    return getattr(settings, 'LMS_PROGRESS_LOG_DIR', None) or os.path.join(settings.BASE_DIR, 'progress_log')
+
+
+def _parse(data):
+    # A crash can leave the last line half written; it was never acknowledged.
+    views = set()
+    for line in data.split(b'\n')[:-1]:
+        student_id, lesson_id = line.split()
+        views.add((int(student_id), int(lesson_id)))
+    return views
+
+
+def replay_logs(directory=None):
+    """Apply the views of segments no live process owns; returns the number of views replayed."""
+    directory = directory or log_dir()
+    if not os.path.isdir(directory):
+        return 0
+    replayed = 0
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.log'):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            segment = open(path, 'rb')
+        except FileNotFoundError:
+            continue
+        with segment:
+            try:
+                fcntl.flock(segment, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            if not os.path.exists(path):
+                continue
+            views = _parse(segment.read())
+            record_lesson_views(views)
+            os.unlink(path)
+            replayed += len(views)
+    return replayed
+
+
+class ProgressRecorder:
+    """Buffers the lesson views of one process; see the module docstring."""
+
+    def __init__(self, directory, flush_size=DEFAULT_FLUSH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL, fsync=False):
+        self.directory = directory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = set()
+        self._segment = None
+        self._sealed = []
+        self._timer = None
+        self._wake = threading.Event()
+
+    def _open_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'views-{self.pid}-{time.time_ns()}.log')
+        # Lock before the file gets the name replay_logs() looks for.
+        segment = open(f'{path}.tmp', 'ab')
+        fcntl.flock(segment, fcntl.LOCK_EX)
+        os.rename(f'{path}.tmp', path)
+        return segment, path
+
+    def record(self, student_id, lesson_id):
+        with self._lock:
+            if self._segment is None:
+                self._segment = self._open_segment()
+            segment = self._segment[0]
+            segment.write(b'%d %d\n' % (student_id, lesson_id))
+            segment.flush()
+            if self.fsync:
+                os.fsync(segment.fileno())
+            self._pending.add((student_id, lesson_id))
+            if self._timer is None:
+                self._timer = threading.Thread(target=self._run_timer, name='lms-progress-flush', daemon=True)
+                self._timer.start()
+            if len(self._pending) >= self.flush_size:
+                # Requests never wait for a flush; the flush thread does it.
+                self._wake.set()
+
+    def flush(self):
+        """Write the buffered views; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                views, self._pending = self._pending, set()
+                segments = self._sealed + ([self._segment] if self._segment else [])
+                self._sealed, self._segment = [], None
+            try:
+                record_lesson_views(views)
+            except Exception:
+                logger.exception('Flushing %d lesson views failed; they stay in the log.', len(views))
+                with self._lock:
+                    self._pending |= views
+                    self._sealed = segments + self._sealed
+                return 0
+            for segment, path in segments:
+                os.unlink(path)
+                segment.close()
+            return len(views)
+
+    def _run_timer(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder():
+    global _recorder
+    with _recorder_lock:
+        # A forked worker must not share its parent's segment.
+        if _recorder is None or _recorder.pid != os.getpid():
+            recorder = ProgressRecorder(
+                log_dir(),
+                flush_size=getattr(settings, 'LMS_PROGRESS_FLUSH_SIZE', DEFAULT_FLUSH_SIZE),
+                flush_interval=getattr(settings, 'LMS_PROGRESS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL),
+                fsync=getattr(settings, 'LMS_PROGRESS_LOG_FSYNC', False),
+            )
+            try:
+                replay_logs(recorder.directory)
+            except Exception:
+                logger.exception('Replaying the lesson view log failed.')
+            atexit.register(recorder.flush)
+            _recorder = recorder
+    return _recorder
+
+
+def record_view(student_id, lesson_id):
+    """Record that a student viewed a lesson, buffered when possible."""
+    if buffering_enabled():
+        get_recorder().record(student_id, lesson_id)
+    else:
+        record_lesson_views([(student_id, lesson_id)])
\ No newline at end of file
@@ -0,0 +1,96 @@
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.shortcuts import redirect
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+
+
+def role_cache():
+    """The cache named by ``LMS_ROLE_CACHE``, or ``None`` when roles are not cached (the default).
+
+    Saving a Profile only drops the entry from the cache of the process that
+    saved it, so caching roles is only safe in a cache every worker shares:
+    with a per-process cache, a demoted instructor would keep instructor
+    rights in the other workers until the entry expired.
+    """
+    alias = getattr(settings, 'LMS_ROLE_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _cache_key(user_id):
+    return f'lms:role:{user_id}'
+
+
+def get_role(request):
+    """Return the role of ``request.user``, or ``''`` when it has no profile.
+
+    The role is looked up once per request, from ``role_cache()`` if one is
+    configured, where it stays until the user's Profile is saved or deleted.
+    """
+    if not hasattr(request, '_lms_role'):
+        cache = role_cache()
+        role = cache.get(_cache_key(request.user.pk)) if cache else None
+        if role is None:
+            role = Profile.objects.filter(user_id=request.user.pk).values_list('role', flat=True).first() or ''
+            if cache:
+                cache.set(_cache_key(request.user.pk), role)
+        request._lms_role = role
+    return request._lms_role
+
+
+def invalidate_role(user_id):
+    cache = role_cache()
+    if cache:
+        cache.delete(_cache_key(user_id))
+
+
+def role_required(*roles, message=None, redirect_to='lms:dashboard'):
+    """Require a profile (with one of ``roles``, if given) and set ``request.role``.
+
+    Use below ``login_required``. Works on sync and async views.
+    """
+    def refuse(request):
+        if not request.role:
+            messages.error(request, 'User profile not found. Please re-register.')
+            return redirect('lms:register')
+        if roles and request.role not in roles:
+            messages.error(request, message)
+            return redirect(redirect_to)
+        return None
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                request.role = await sync_to_async(get_role)(request)
+                return refuse(request) or await view(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            request.role = get_role(request)
+            return refuse(request) or view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RoleMiddleware:
+    """Expose the user's role as a lazily resolved ``request.role``.
+
+    Optional: ``role_required`` resolves the role itself, this only makes it
+    available to views and templates that are not decorated.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.user.is_authenticated:
+            request.role = SimpleLazyObject(lambda: get_role(request))
+        return self.get_response(request)
\ No newline at end of file
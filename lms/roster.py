@@ -0,0 +1,94 @@
+"""Bulk enrollment of students listed in a roster file.
+
+A roster is a CSV file with a header row and a ``username`` or ``email``
+column (or both; the username wins when a row has both). It is read one row
+at a time and enrolled in batches, so its size is not limited by memory.
+"""
+import csv
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .course_io import batches
+from .models import Enrollment, Certificate, CourseProgress
+
+# Unmatched names kept for the report; the rest are only counted.
+UNMATCHED_SAMPLE = 20
+
+
+def read_roster(stream):
+    """Yield the username or email of every row of a CSV roster."""
+    reader = csv.DictReader(stream)
+    fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+    if 'username' not in fields and 'email' not in fields:
+        raise ValueError('The roster needs a "username" or "email" column.')
+    # Only existing columns: cells beyond the header are stored under None.
+    columns = [fields[name] for name in ('username', 'email') if name in fields]
+    for row in reader:
+        identifier = next((str(row[column]).strip() for column in columns if row[column]), '')
+        if identifier:
+            yield identifier
+
+
+def _resolve(identifiers):
+    """Map each identifier to ``(user id, role)``; usernames match exactly, emails ignore case."""
+    emails = {identifier.lower() for identifier in identifiers if '@' in identifier}
+    rows = (User.objects.annotate(email_lower=Lower('email'))
+            .filter(Q(username__in=identifiers) | Q(email_lower__in=emails))
+            .values_list('id', 'username', 'email_lower', 'profile__role'))
+    resolved = {}
+    for user_id, username, email, role in rows:
+        resolved[username] = (user_id, role)
+        if email in emails:
+            resolved.setdefault(email, (user_id, role))
+    return {
+        identifier: resolved.get(identifier) or resolved.get(identifier.lower())
+        for identifier in identifiers
+    }
+
+
+def _enroll_batch(course, identifiers, totals, unmatched):
+    student_ids = set()
+    for identifier, match in _resolve(set(identifiers)).items():
+        if match is None:
+            totals['unmatched'] += 1
+            if len(unmatched) < UNMATCHED_SAMPLE:
+                unmatched.append(identifier)
+        elif match[1] != 'student':
+            totals['not students'] += 1
+        else:
+            student_ids.add(match[0])
+    existing = set(Enrollment.objects.filter(course=course, student_id__in=student_ids)
+                   .values_list('student_id', flat=True))
+    new_ids = sorted(student_ids - existing)
+    totals['enrolled'] += len(new_ids)
+    totals['already enrolled'] += len(student_ids & existing)
+    if not new_ids:
+        return
+    # ignore_conflicts: a student may enroll themselves while the roster runs.
+    with transaction.atomic():
+        for model in (Enrollment, Certificate, CourseProgress):
+            model.objects.bulk_create([model(student_id=student_id, course_id=course.id) for student_id in new_ids],
+                                      ignore_conflicts=True)
+
+
+def enroll_roster(course, identifiers, batch_size=1000, progress=None):
+    """Enroll the students named by ``identifiers`` in ``course``.
+
+    Each batch takes one query to find the users, one to find who is already
+    enrolled and one transaction to create their enrollments, certificates
+    and progress rows. ``progress``, if given, is called with the running
+    totals after every batch. Returns ``(totals, unmatched)``, where
+    ``unmatched`` holds the first few identifiers that matched no user.
+    """
+    totals = Counter(dict.fromkeys(['rows', 'enrolled', 'already enrolled', 'not students', 'unmatched'], 0))
+    unmatched = []
+    for batch in batches(identifiers, batch_size):
+        totals['rows'] += len(batch)
+        _enroll_batch(course, batch, totals, unmatched)
+        if progress:
+            progress(totals)
+    return dict(totals), unmatched
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Full-text search over course, lesson and assignment text.
+
+On SQLite the index is the FTS5 table ``lms_search`` (created by migration
+0007). Its rowid encodes the kind and primary key of the indexed object, so
+a row can be replaced or removed without scanning the table. Other
+databases fall back to ``icontains`` lookups. Searches use the database
+the router reads courses from, i.e. the replica in ``@read_replica`` views;
+index updates go to the one courses are written to.
+"""
+import re
+from collections import namedtuple
+from itertools import chain, islice
+
+from django.db import connections, router
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Course, Lesson, Assignment
+
+TABLE = 'lms_search'
+PAGE_SIZE = 20
+
+# rowid = pk * KIND_SLOTS + kind
+KIND_SLOTS = 4
+KINDS = {Course: 1, Lesson: 2, Assignment: 3}
+KIND_NAMES = {1: 'course', 2: 'lesson', 3: 'assignment'}
+
+# Title matches weigh ten times as much as matches in the body.
+RANK = f'bm25({TABLE}, 0, 10.0, 1.0)'
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'
+
+SearchHit = namedtuple('SearchHit', 'kind object_id course_id title snippet course_title', defaults=[''])
+
+
+def _connection(write=False):
+    return connections[router.db_for_write(Course) if write else router.db_for_read(Course)]
+
+
+def fts_enabled(connection=None):
+    return (connection or _connection(write=True)).vendor == 'sqlite'
+
+
+def _document(instance):
+    course_id = instance.id if isinstance(instance, Course) else instance.course_id
+    body = getattr(instance, 'description', '')
+    return instance.id * KIND_SLOTS + KINDS[type(instance)], course_id, instance.title, body
+
+
+def index_objects(instances, created=True):
+    """Add the index rows of new courses, lessons and assignments.
+
+    Pass ``created=False`` to replace the rows of objects already indexed.
+    """
+    connection = _connection(write=True)
+    if not fts_enabled(connection):
+        return
+    documents = [_document(instance) for instance in instances]
+    with connection.cursor() as cursor:
+        if not created:
+            cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(document[0],) for document in documents])
+        cursor.executemany(
+            f'INSERT INTO {TABLE} (rowid, course_id, title, body) VALUES (%s, %s, %s, %s)', documents
+        )
+
+
+def remove_objects(instances):
+    connection = _connection(write=True)
+    if not fts_enabled(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {TABLE} WHERE rowid = %s',
+            [(instance.id * KIND_SLOTS + KINDS[type(instance)],) for instance in instances],
+        )
+
+
+def rebuild_index(batch_size=1000, progress=None):
+    """Recreate every index row from the model tables; returns the row count.
+
+    ``progress``, if given, is called with the running count after every
+    batch.
+    """
+    connection = _connection(write=True)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+    indexed = 0
+    for model, fields in ((Course, ('id', 'title', 'description')),
+                          (Lesson, ('id', 'course_id', 'title')),
+                          (Assignment, ('id', 'course_id', 'title', 'description'))):
+        objects = model.objects.only(*fields).order_by('id').iterator(chunk_size=batch_size)
+        while batch := list(islice(objects, batch_size)):
+            index_objects(batch)
+            indexed += len(batch)
+            if progress:
+                progress(indexed)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+    return indexed
+
+
+def match_expression(text):
+    """Turn user input into an FTS5 query: every word must match, the last as a prefix."""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"' for word in words[:-1]) + (f' "{words[-1]}"*' if words else '')
+
+
+def _highlight(snippet):
+    return mark_safe(escape(snippet).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>'))
+
+
+def _search_fts(text, offset, limit):
+    expression = match_expression(text)
+    if not expression:
+        return []
+    with _connection().cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, course_id, title, snippet({TABLE}, -1, %s, %s, '…', 16) FROM {TABLE} "
+            f'WHERE {TABLE} MATCH %s ORDER BY {RANK} LIMIT %s OFFSET %s',
+            [HIGHLIGHT_START, HIGHLIGHT_END, expression, limit, offset],
+        )
+        return [
+            SearchHit(KIND_NAMES[rowid % KIND_SLOTS], rowid // KIND_SLOTS, course_id, title, _highlight(snippet))
+            for rowid, course_id, title, snippet in cursor.fetchall()
+        ]
+
+
+def search_icontains(text, offset, limit):
+    """Unranked substring search; the fallback for databases without FTS5."""
+    text = text.strip()
+    if not text:
+        return []
+    matches = chain(
+        (SearchHit('course', pk, pk, title, escape(body[:200]))
+         for pk, title, body in Course.objects.filter(Q(title__icontains=text) | Q(description__icontains=text))
+         .order_by('id').values_list('id', 'title', 'description').iterator()),
+        (SearchHit('lesson', pk, course_id, title, '')
+         for pk, course_id, title in Lesson.objects.filter(title__icontains=text)
+         .order_by('id').values_list('id', 'course_id', 'title').iterator()),
+        (SearchHit('assignment', pk, course_id, title, escape(body[:200]))
+         for pk, course_id, title, body in Assignment.objects.filter(Q(title__icontains=text) | Q(description__icontains=text))
+         .order_by('id').values_list('id', 'course_id', 'title', 'description').iterator()),
+    )
+    return list(islice(matches, offset, offset + limit))
+
+
+def query_index(text, page=1, page_size=PAGE_SIZE):
+    """Return ``(hits, has_next)`` for one page of results, best matches first."""
+    search = _search_fts if fts_enabled(_connection()) else search_icontains
+    hits = search(text, (page - 1) * page_size, page_size + 1)
+    has_next = len(hits) > page_size
+    hits = hits[:page_size]
+    titles = dict(Course.objects.filter(id__in={hit.course_id for hit in hits}).values_list('id', 'title'))
+    return [hit._replace(course_title=titles.get(hit.course_id, '')) for hit in hits], has_next
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""Deterministic bulk generation of LMS data for local load testing.
+
+``seed()`` writes every row with ``bulk_create()``, so no model signal
+runs: it sets the course totals, progress counters, completed certificates
+and search index itself. The same ``Volumes`` and seed always produce the
+same rows; only the primary keys depend on what the database held before.
+"""
+import hashlib
+import random
+from collections import namedtuple
+from itertools import chain
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .completion import mark_completed
+from .grading import PASS_MARK
+from .models import (Profile, Course, Lesson, Quiz, Question, Assignment, Enrollment, LessonProgress, QuizAttempt,
+                     Submission, Certificate, CourseProgress)
+from .search import index_objects
+from .uploads import blob_path
+
+# Per-course and per-student volumes; views, submissions and attempts are
+# the share of a course's lessons, assignments and quizzes each enrolled
+# student has done, on average.
+Volumes = namedtuple(
+    'Volumes', 'instructors students courses lessons quizzes questions assignments enrollments views submissions attempts',
+    defaults=[10, 1000, 100, 10, 2, 5, 2, 5, 0.6, 0.5, 0.5],
+)
+
+WORDS = ('algebra biology chemistry data design economics ethics geometry graph history kinetics language '
+         'logic machine music network physics programming statistics systems theory writing zoology').split()
+SUBMISSION = b'Seeded submission.\n'
+SUBMISSION_SHA256 = hashlib.sha256(SUBMISSION).hexdigest()
+
+
+def _text(rng, length):
+    return ' '.join(rng.choices(WORDS, k=length)).capitalize()
+
+
+def _video_url(rng):
+    video_id = ''.join(rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-', k=11))
+    return f'https://www.youtube.com/watch?v={video_id}'
+
+
+def _users(prefix, role, numbers, password):
+    users = User.objects.bulk_create(
+        User(username=f'{prefix}_{role}_{i}', email=f'{prefix}_{role}_{i}@example.com', password=password)
+        for i in numbers
+    )
+    Profile.objects.bulk_create(Profile(user=user, role=role) for user in users)
+    return users
+
+
+def _catalog(rng, volumes, instructors):
+    courses = Course.objects.bulk_create(
+        Course(title=_text(rng, 3), description=_text(rng, 40), instructor=rng.choice(instructors),
+               lesson_count=volumes.lessons, quiz_count=volumes.quizzes, assignment_count=volumes.assignments)
+        for _ in range(volumes.courses)
+    )
+    lessons = [Lesson(course=course, title=_text(rng, 4), video_url=_video_url(rng))
+               for course in courses for _ in range(volumes.lessons)]
+    for lesson in lessons:
+        lesson.normalize_video()
+    Lesson.objects.bulk_create(lessons)
+    quizzes = Quiz.objects.bulk_create(Quiz(course=course, title=_text(rng, 3))
+                                       for course in courses for _ in range(volumes.quizzes))
+    Question.objects.bulk_create(
+        Question(quiz=quiz, text=f'{_text(rng, 8)}?', option1=_text(rng, 2), option2=_text(rng, 2),
+                 option3=_text(rng, 2), option4=_text(rng, 2), correct_option=rng.randint(1, 4))
+        for quiz in quizzes for _ in range(volumes.questions)
+    )
+    assignments = Assignment.objects.bulk_create(Assignment(course=course, title=_text(rng, 3), description=_text(rng, 30))
+                                                 for course in courses for _ in range(volumes.assignments))
+    index_objects(chain(courses, lessons, assignments))
+    content = {course.id: {'lessons': [], 'quizzes': [], 'assignments': []} for course in courses}
+    for kind, objects in (('lessons', lessons), ('quizzes', quizzes), ('assignments', assignments)):
+        for obj in objects:
+            content[obj.course_id][kind].append(obj.id)
+    return content
+
+
+def _activity(seed, volumes, students, content, blob):
+    course_ids = sorted(content)
+    rows = {model: [] for model in (Enrollment, Certificate, CourseProgress, LessonProgress, QuizAttempt, Submission)}
+    for student in students:
+        rng = random.Random(f'{seed}:{student.username}')
+        for course_id in rng.sample(course_ids, min(volumes.enrollments, len(course_ids))):
+            course = content[course_id]
+            viewed = [lesson_id for lesson_id in course['lessons'] if rng.random() < volumes.views]
+            submitted = [assignment_id for assignment_id in course['assignments'] if rng.random() < volumes.submissions]
+            passed = 0
+            for quiz_id in course['quizzes']:
+                if rng.random() < volumes.attempts:
+                    score = rng.randint(0, volumes.questions)
+                    rows[QuizAttempt].append(QuizAttempt(
+                        student=student, quiz_id=quiz_id, score=score, total=volumes.questions,
+                        passed=volumes.questions > 0 and score / volumes.questions >= PASS_MARK,
+                    ))
+                    passed += rows[QuizAttempt][-1].passed
+            rows[Enrollment].append(Enrollment(student=student, course_id=course_id))
+            rows[Certificate].append(Certificate(student=student, course_id=course_id))
+            rows[CourseProgress].append(CourseProgress(student=student, course_id=course_id, lessons_viewed=len(viewed),
+                                                       assignments_submitted=len(submitted), quizzes_passed=passed))
+            rows[LessonProgress].extend(LessonProgress(student=student, lesson_id=lesson_id, viewed=True)
+                                        for lesson_id in viewed)
+            rows[Submission].extend(Submission(student=student, assignment_id=assignment_id, file=blob,
+                                               original_name='submission.txt', size=len(SUBMISSION),
+                                               sha256=SUBMISSION_SHA256)
+                                    for assignment_id in submitted)
+    return rows
+
+
+def seed(volumes=Volumes(), seed=0, prefix='seed', password='seed', batch_size=500, progress=None):
+    """Create ``volumes`` worth of users, courses and activity; returns the row count per model.
+
+    Usernames start with ``prefix``; every seeded user has ``password``.
+    Students are written ``batch_size`` at a time, each batch in its own
+    transaction, and ``progress``, if given, is called with the number of
+    students written after each batch. Certificates are marked completed
+    once every student is in.
+    """
+    rng = random.Random(seed)
+    counts = dict.fromkeys(['users', 'courses', 'lessons', 'quizzes', 'questions', 'assignments', 'enrollments',
+                            'lesson views', 'quiz attempts', 'submissions'], 0)
+    blob = blob_path(SUBMISSION_SHA256)
+    if not default_storage.exists(blob):
+        default_storage.save(blob, ContentFile(SUBMISSION))
+    # Hashing once keeps a million users from taking hours.
+    password = make_password(password)
+
+    with transaction.atomic():
+        instructors = _users(prefix, 'instructor', range(volumes.instructors), password)
+        content = _catalog(rng, volumes, instructors) if instructors else {}
+    counts['users'] = len(instructors)
+    counts['courses'] = len(content)
+    for kind in ('lessons', 'quizzes', 'assignments'):
+        counts[kind] = sum(len(course[kind]) for course in content.values())
+    counts['questions'] = counts['quizzes'] * volumes.questions
+
+    for start in range(0, volumes.students, batch_size):
+        with transaction.atomic():
+            students = _users(prefix, 'student', range(start, min(start + batch_size, volumes.students)), password)
+            rows = _activity(seed, volumes, students, content, blob)
+            for model, objects in rows.items():
+                model.objects.bulk_create(objects, batch_size=batch_size)
+        counts['users'] += len(students)
+        counts['enrollments'] += len(rows[Enrollment])
+        counts['lesson views'] += len(rows[LessonProgress])
+        counts['quiz attempts'] += len(rows[QuizAttempt])
+        counts['submissions'] += len(rows[Submission])
+        if progress:
+            progress(start + len(students))
+
+    course_ids = sorted(content)
+    for start in range(0, len(course_ids), batch_size):
+        mark_completed(course_ids[start:start + batch_size])
+    return counts
\ No newline at end of file
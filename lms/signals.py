@@ -0,0 +1,125 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .auth import invalidate_user
+from .completion import adjust_progress, rebuild_progress
+from .roles import invalidate_role
+from .search import index_objects, remove_objects
+from .structure import bump_version, forget_structure
+from .models import Profile, Course, Lesson, LessonProgress, Quiz, Question, Assignment, Submission, QuizAttempt
+
+
+def _deleted_directly(sender, origin):
+    # Rows removed by a cascade are accounted for by the handler of the
+    # object the delete started from.
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is sender
+
+
+@receiver([post_save, post_delete], sender=Question)
+def question_changed(sender, instance, origin=None, **kwargs):
+    # Also moves lms.grading to a new answer key.
+    if origin is None or _deleted_directly(sender, origin):
+        bump_version(Course.objects.filter(quiz__id=instance.quiz_id))
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_role(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Every login saves last_login; a cached copy with an older one is fine.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        invalidate_user(instance.pk)
+
+
+@receiver(pre_save, sender=LessonProgress)
+def lesson_progress_loading(sender, instance, **kwargs):
+    instance._was_viewed = bool(instance.pk) and LessonProgress.objects.filter(pk=instance.pk, viewed=True).exists()
+
+
+@receiver(post_save, sender=LessonProgress)
+def lesson_progress_saved(sender, instance, **kwargs):
+    if instance.viewed != instance._was_viewed:
+        adjust_progress(instance.student_id, instance.lesson.course_id, 'lessons_viewed', 1 if instance.viewed else -1)
+
+
+@receiver(post_delete, sender=LessonProgress)
+def lesson_progress_deleted(sender, instance, origin=None, **kwargs):
+    if instance.viewed and _deleted_directly(sender, origin):
+        adjust_progress(instance.student_id, instance.lesson.course_id, 'lessons_viewed', -1)
+
+
+@receiver(post_save, sender=Submission)
+def submission_saved(sender, instance, created, **kwargs):
+    # A student has at most one submission per assignment; resubmitting
+    # updates it in place.
+    if created:
+        adjust_progress(instance.student_id, instance.assignment.course_id, 'assignments_submitted', 1)
+
+
+@receiver(post_delete, sender=Submission)
+def submission_deleted(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(sender, origin):
+        adjust_progress(instance.student_id, instance.assignment.course_id, 'assignments_submitted', -1)
+
+
+@receiver(post_save, sender=QuizAttempt)
+def quiz_attempt_saved(sender, instance, created, **kwargs):
+    others = QuizAttempt.objects.filter(student_id=instance.student_id, quiz_id=instance.quiz_id, passed=True).exclude(pk=instance.pk)
+    if created and instance.passed and not others.exists():
+        adjust_progress(instance.student_id, instance.quiz.course_id, 'quizzes_passed', 1)
+
+
+@receiver(post_delete, sender=QuizAttempt)
+def quiz_attempt_deleted(sender, instance, origin=None, **kwargs):
+    if not instance.passed or not _deleted_directly(sender, origin):
+        return
+    remaining = QuizAttempt.objects.filter(student_id=instance.student_id, quiz_id=instance.quiz_id, passed=True)
+    if not remaining.exists():
+        adjust_progress(instance.student_id, instance.quiz.course_id, 'quizzes_passed', -1)
+
+
+COURSE_TOTALS = {Lesson: 'lesson_count', Assignment: 'assignment_count', Quiz: 'quiz_count'}
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=Assignment)
+@receiver(post_save, sender=Quiz)
+def content_saved(sender, instance, created, **kwargs):
+    totals = {COURSE_TOTALS[sender]: 1} if created else {}
+    bump_version(Course.objects.filter(pk=instance.course_id), **totals)
+
+
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_delete, sender=Quiz)
+def content_removed(sender, instance, origin=None, **kwargs):
+    # Removing content can finish a course for students who had done
+    # everything else, so recount the course rather than adjust it.
+    if _deleted_directly(sender, origin):
+        bump_version(Course.objects.filter(pk=instance.course_id))
+        rebuild_progress([instance.course_id])
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_save, sender=Assignment)
+def searchable_saved(sender, instance, created, **kwargs):
+    index_objects([instance], created=created)
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+@receiver(post_delete, sender=Assignment)
+def searchable_deleted(sender, instance, **kwargs):
+    remove_objects([instance])
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    forget_structure(instance)
\ No newline at end of file
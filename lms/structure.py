@@ -0,0 +1,101 @@
+"""Cached course structure: the lessons, quizzes and assignments of a course.
+
+Both the structure rows and the HTML fragment rendered from them are cached
+under the course's ``structure_version``, which the signals bump whenever a
+lesson, quiz, assignment or question changes. Entries for old versions are
+never read again and age out of the cache, so the cache named by
+``LMS_STRUCTURE_CACHE`` (default ``'default'``) should evict least recently
+used entries, as the local-memory backend does.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, F
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Lesson, Quiz, Assignment
+
+
+def structure_cache():
+    return caches[getattr(settings, 'LMS_STRUCTURE_CACHE', 'default')]
+
+
+# Bump when the shape of the cached rows or fragment changes.
+FORMAT = 2
+
+
+def _rows_key(course):
+    return f'lms:structure:{FORMAT}:{course.id}:{course.structure_version}'
+
+
+def _html_key(course):
+    return f'lms:structure_html:{FORMAT}:{course.id}:{course.structure_version}'
+
+
+def bump_version(courses, **totals):
+    """Move ``courses`` (a Course queryset) to a new structure version.
+
+    ``totals`` maps course total fields to deltas applied in the same UPDATE.
+    """
+    courses.update(structure_version=F('structure_version') + 1,
+                   **{field: F(field) + delta for field, delta in totals.items()})
+
+
+def forget_structure(course):
+    # Ids can be reused after a delete, and a new course starts at version 0.
+    structure_cache().delete_many([_rows_key(course), _html_key(course)])
+
+
+def _load_rows(courses):
+    course_ids = [course.id for course in courses]
+    rows = {course_id: {'lessons': [], 'quizzes': [], 'assignments': []} for course_id in course_ids}
+    lessons = (Lesson.objects.filter(course_id__in=course_ids).order_by('id')
+               .values_list('course_id', 'id', 'title', 'embed_url'))
+    for course_id, *lesson in lessons:
+        rows[course_id]['lessons'].append(tuple(lesson))
+    quizzes = (Quiz.objects.filter(course_id__in=course_ids).order_by('id')
+               .annotate(question_count=Count('questions')).values_list('course_id', 'id', 'title', 'question_count'))
+    for course_id, *quiz in quizzes:
+        rows[course_id]['quizzes'].append(tuple(quiz))
+    assignments = Assignment.objects.filter(course_id__in=course_ids).order_by('id').values_list('course_id', 'id', 'title')
+    for course_id, *assignment in assignments:
+        rows[course_id]['assignments'].append(tuple(assignment))
+    return [rows[course_id] for course_id in course_ids]
+
+
+def _cached(courses, key, load):
+    cache = structure_cache()
+    keys = {key(course): course for course in courses}
+    found = cache.get_many(keys)
+    missing = [course for cache_key, course in keys.items() if cache_key not in found]
+    if missing:
+        fresh = {key(course): value for course, value in zip(missing, load(missing))}
+        cache.set_many(fresh, None)
+        found.update(fresh)
+    return [found[key(course)] for course in courses]
+
+
+def course_structure(courses):
+    """Return the ``{'lessons', 'quizzes', 'assignments'}`` rows of each course, in order.
+
+    ``courses`` need ``id`` and ``structure_version``. Rows are ``(id,
+    title)`` tuples, with the embed URL appended for lessons and the
+    question count for quizzes.
+    """
+    return _cached(courses, _rows_key, _load_rows)
+
+
+def attach_structure_html(courses):
+    """Set ``structure_html`` on each course to its rendered lesson, quiz and assignment lists.
+
+    The fragment is the same for every user; per-user state such as the
+    enrollment badge is rendered around it.
+    """
+    courses = list(courses)
+    fragments = _cached(courses, _html_key, lambda missing: [
+        render_to_string('course_structure.html', {'course': course, **rows})
+        for course, rows in zip(missing, course_structure(missing))
+    ])
+    for course, fragment in zip(courses, fragments):
+        course.structure_html = mark_safe(fragment)
+    return courses
\ No newline at end of file
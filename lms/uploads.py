@@ -0,0 +1,60 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+
+DEFAULT_MAX_SUBMISSION_SIZE = 20 * 1024 * 1024
+# Room for the CSRF token and multipart headers around the file itself.
+FORM_OVERHEAD = 64 * 1024
+
+
+def max_submission_size():
+    return getattr(settings, 'LMS_MAX_SUBMISSION_SIZE', DEFAULT_MAX_SUBMISSION_SIZE)
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temporary file, hashing and size-checking each chunk."""
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.exceeded = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.max_size is not None and self.received > self.max_size:
+            self.exceeded = True
+            self.file.close()
+            raise StopUpload(connection_reset=True)
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+def blob_path(sha256):
+    return f'submissions/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def store_blob(uploaded_file):
+    """Store an upload from ``HashingUploadHandler`` by content and return its path.
+
+    Identical files share one blob, so a file that is already stored is not
+    written again.
+    """
+    path = blob_path(uploaded_file.sha256)
+    if not default_storage.exists(path):
+        saved = default_storage.save(path, uploaded_file)
+        if saved != path:
+            # Another request stored the same content first.
+            default_storage.delete(saved)
+    return path
\ No newline at end of file
@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views, api
+
+# Under ASGI the read-heavy pages can be served by their async versions.
+read_views = async_views if getattr(settings, 'LMS_ASYNC_VIEWS', False) else views
 
 app_name = 'lms'  # Added to match the namespace in django_lms/urls.py
 
@@ -8,16 +12,21 @@ urlpatterns = [
     path('login/', views.user_login, name='user_login'),
     path('register/', views.register, name='register'),
     path('logout/', views.user_logout, name='user_logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
-    path('instructor_dashboard/', views.instructor_dashboard, name='instructor_dashboard'),
-    path('courses/', views.course_list, name='course_list'),
+    path('dashboard/', read_views.dashboard, name='dashboard'),
+    path('instructor_dashboard/', read_views.instructor_dashboard, name='instructor_dashboard'),
+    path('courses/', read_views.course_list, name='course_list'),
     path('courses/create/', views.course_create, name='course_create'),
+    path('search/', views.search, name='search'),
     path('enroll/<int:course_id>/', views.enroll, name='enroll'),
     path('courses/<int:course_id>/lessons/create/', views.lesson_create, name='lesson_create'),
-    path('courses/<int:course_id>/lessons/<int:lesson_id>/', views.lesson_detail, name='lesson_detail'),
+    path('courses/<int:course_id>/lessons/<int:lesson_id>/', read_views.lesson_detail, name='lesson_detail'),
     path('courses/<int:course_id>/quizzes/create/', views.quiz_create, name='quiz_create'),
     path('courses/<int:course_id>/quizzes/<int:quiz_id>/', views.quiz_take, name='quiz_take'),
     path('courses/<int:course_id>/assignments/create/', views.assignment_create, name='assignment_create'),
     path('courses/<int:course_id>/assignments/<int:assignment_id>/submit/', views.assignment_submit, name='assignment_submit'),
+    path('courses/<int:course_id>/roster/', views.roster_upload, name='roster_upload'),
+    path('courses/<int:course_id>/gradebook/', views.gradebook_export, name='gradebook_export'),
     path('certificates/<int:certificate_id>/', views.certificate_view, name='certificate_view'),
+    path('api/progress/', api.progress, name='api_progress'),
+    path('api/progress/<int:course_id>/', api.course_progress, name='api_course_progress'),
 ]
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Turn the video links instructors paste into embeddable player URLs.
+
+Recognised links:
+
+* YouTube: ``youtube.com/watch?v=ID``, ``youtu.be/ID``, ``youtube.com/shorts/ID``,
+  ``/embed/ID`` and ``/live/ID`` on ``www.``, ``m.`` and ``youtube-nocookie.com``,
+  with an optional ``t=``/``start=`` timestamp (``90``, ``90s``, ``1h2m3s``).
+* Vimeo: ``vimeo.com/ID`` and ``player.vimeo.com/video/ID``, with an optional
+  ``#t=`` timestamp.
+
+``Lesson.save()`` stores the result, so views never parse links.
+"""
+import re
+from collections import namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+Video = namedtuple('Video', 'provider video_id embed_url')
+
+YOUTUBE_HOSTS = {'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com',
+                 'youtube-nocookie.com', 'www.youtube-nocookie.com'}
+YOUTUBE_ID = re.compile(r'[A-Za-z0-9_-]{11}')
+YOUTUBE_PATH = re.compile(r'/(?:shorts|embed|live|v)/([A-Za-z0-9_-]{11})/?')
+VIMEO_HOSTS = {'vimeo.com', 'www.vimeo.com', 'player.vimeo.com'}
+VIMEO_PATH = re.compile(r'/(?:video/)?(\d+)/?')
+TIMESTAMP = re.compile(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?')
+
+
+def _seconds(value):
+    match = TIMESTAMP.fullmatch(value or '')
+    if not match or not any(match.groups()):
+        return 0
+    hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _youtube(host, path, query):
+    if host == 'youtu.be':
+        video_id = path.strip('/')
+    elif path.rstrip('/') == '/watch':
+        video_id = query.get('v', [''])[0]
+    else:
+        match = YOUTUBE_PATH.fullmatch(path)
+        video_id = match.group(1) if match else ''
+    if not YOUTUBE_ID.fullmatch(video_id):
+        return None
+    start = _seconds(query.get('t', query.get('start', ['']))[0])
+    embed_url = f'https://www.youtube.com/embed/{video_id}' + (f'?start={start}' if start else '')
+    return Video('youtube', video_id, embed_url)
+
+
+def _vimeo(path, fragment):
+    match = VIMEO_PATH.fullmatch(path)
+    if not match:
+        return None
+    start = _seconds(fragment[2:] if fragment.startswith('t=') else '')
+    embed_url = f'https://player.vimeo.com/video/{match.group(1)}' + (f'#t={start}s' if start else '')
+    return Video('vimeo', match.group(1), embed_url)
+
+
+def parse_video(url):
+    """Return the ``Video`` a link points to, or None if it cannot be embedded."""
+    url = (url or '').strip()
+    if '://' not in url:
+        url = f'https://{url}'
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    host = (parts.hostname or '').lower()
+    if host in YOUTUBE_HOSTS or host == 'youtu.be':
+        return _youtube(host, parts.path, parse_qs(parts.query))
+    if host in VIMEO_HOSTS:
+        return _vimeo(parts.path, parts.fragment)
+    return None
\ No newline at end of file
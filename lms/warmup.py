@@ -0,0 +1,47 @@
+"""Work a new worker process would otherwise do while serving its first requests.
+
+Django compiles a template the first time it is rendered and builds the URL
+resolver's lookup tables the first time a URL is reversed. ``warm_up()`` does
+both ahead of time, so the first requests a worker serves cost the same as
+the rest. It runs from ``LmsConfig.ready()`` when ``LMS_WARM_UP`` is set, i.e.
+once per worker before it accepts traffic, or once in the master process with
+``gunicorn --preload``. Compiled templates are only kept by the cached template
+loader, which Django uses unless ``TEMPLATES`` lists its own ``loaders``.
+"""
+import os
+import time
+
+from django.apps import apps
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+
+def template_names(app_label='lms'):
+    root = os.path.join(apps.get_app_config(app_label).path, 'templates')
+    for directory, _, files in os.walk(root):
+        for name in sorted(files):
+            if name.endswith('.html'):
+                yield os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+
+
+def _populate(resolver):
+    # Reading reverse_dict compiles every pattern below the resolver, except
+    # those of namespaced includes, which have resolvers of their own.
+    resolver.reverse_dict
+    for _, namespace_resolver in resolver.namespace_dict.values():
+        _populate(namespace_resolver)
+
+
+def warm_up():
+    """Compile the lms templates and the URL patterns; return the time taken in seconds."""
+    started = time.perf_counter()
+    if apps.is_installed('django.contrib.admin'):
+        from django.contrib import admin
+
+        # The URLconf reads the admin site's registry when it is imported, so
+        # every admin module must be loaded first, whatever the app order.
+        admin.autodiscover()
+    for name in template_names():
+        get_template(name)
+    _populate(get_resolver())
+    return time.perf_counter() - started
\ No newline at end of file